@@ -1,6 +1,10 @@
 import os
 import time
+
 import chess
+import orjson
+from websockets.exceptions import ConnectionClosed, InvalidHandshake
+from websockets.sync.client import connect
 from .api_client import APIClient
 
 BASE_URL = os.getenv("CHESS_ARENA_URL", "http://127.0.0.1:8001")
@@ -12,13 +16,39 @@ API_KEY = os.getenv("BOT_API_KEY", "")
 BOT_MODE = os.getenv("BOT_MODE", "pvp").lower()
 RANKED = os.getenv("BOT_RANKED", "false").lower() == "true"
 
+# Resync backoff while the socket stays silent
+IDLE_MIN = 30.0
+IDLE_MAX = 120.0
+
+# Pause between attempts to reopen a dropped game socket
+RECONNECT_SEC = 2.0
+
+
+def ws_url(http_base: str, game_id: int) -> str:
+    base = http_base.replace("http://", "ws://").replace("https://", "wss://")
+    return f"{base}/games/ws/{game_id}"
+
+
+def open_game_ws(game_id: int):
+    return connect(ws_url(BASE_URL, game_id), compression=None, max_size=1 << 20, max_queue=64)
+
+
+def reconnect_game_ws(game_id: int):
+    """Reopen the game socket, retrying until the server accepts it again."""
+    while True:
+        try:
+            return open_game_ws(game_id)
+        except (OSError, InvalidHandshake):
+            time.sleep(RECONNECT_SEC)
+
+
+def board_from_fen(fen: str) -> chess.Board:
+    return chess.Board() if (not fen or fen == "startpos") else chess.Board(fen)
+
 
-def pick_random_legal_move(fen: str) -> str:
-    b = chess.Board() if (not fen or fen == "startpos") else chess.Board(fen)
-    moves = list(b.legal_moves)
-    if not moves:
-        return ""
-    return moves[0].uci()
+def pick_random_legal_move(board: chess.Board) -> str:
+    # Stop at the first generated move instead of listing them all
+    return next((m.uci() for m in board.legal_moves), "")
 
 
 def main():
@@ -34,54 +64,84 @@ def main():
     vs_system = BOT_MODE == "system"
 
     # ---- Queue ----
-    q = api.queue(ranked=RANKED, vs_system=vs_system)
-    print("Queue response:", q)
-
-    game_id = q.get("game_id")
-
-    # If waiting (PvP), poll until matched
-    while not game_id:
-        time.sleep(1)
-        q = api.queue(ranked=RANKED, vs_system=vs_system)
-        print("Queue update:", q)
-        game_id = q.get("game_id")
+    # One request queues, waits for the match and returns the game
+    g = api.queue_and_wait(ranked=RANKED, vs_system=vs_system)
+    while not g.get("game_id"):
+        print("Still waiting for an opponent...")
+        g = api.queue_and_wait(ranked=RANKED, vs_system=vs_system)
 
+    game_id = g["game_id"]
     print("Matched into game:", game_id)
 
-    # ---- Wait for game start ----
-    while True:
-        g = api.get_game(game_id)
-        if g.get("status") == "active":
-            break
-        time.sleep(0.5)
-
-    print("Game active:",
-          "White:", g.get("white_id"),
-          "Black:", g.get("black_id"))
-
-    # ---- Main loop ----
-    while True:
-        g = api.get_game(game_id)
-
-        if g.get("status") != "active":
-            print("Game ended:", g.get("result"), g.get("end_reason"))
-            break
-
-        turn = g.get("meta", {}).get("turn")
-        my_id = api.player_id
-
-        my_turn = (
-            (turn == "white" and my_id == g.get("white_id")) or
-            (turn == "black" and my_id == g.get("black_id"))
-        )
-
-        if my_turn:
-            uci = pick_random_legal_move(g.get("fen", "startpos"))
-            if uci:
-                api.move(game_id, uci)
-                print("Played:", uci)
-
-        time.sleep(0.5)
+    # ---- Play over the game's WebSocket ----
+    ws = open_game_ws(game_id)
+    try:
+        # The opponent may have moved before we subscribed; only then re-read
+        if (g.get("seq", 0) % 2 == 0) != (api.player_id == g.get("white_id")):
+            g = api.get_game(game_id)
+
+        print("Game active:",
+              "White:", g.get("white_id"),
+              "Black:", g.get("black_id"))
+
+        my_color = chess.WHITE if api.player_id == g.get("white_id") else chess.BLACK
+        # One live board for the whole game; each move event is pushed onto it
+        board = board_from_fen(g.get("fen", "startpos"))
+        status = g.get("status")
+        last = g  # latest game state or move event
+        played = None
+        idle = IDLE_MIN  # seconds without events before an HTTP resync
+
+        while status == "active":
+            # Turn comes straight from the live board; no HTTP round-trip
+            seq = board.ply()
+            if seq != played and board.turn == my_color:
+                uci = pick_random_legal_move(board)
+                if uci:
+                    api.move(game_id, uci)
+                    print("Played:", uci)
+                played = seq
+
+            try:
+                data = orjson.loads(ws.recv(timeout=idle))
+            except (TimeoutError, ConnectionClosed) as e:
+                if isinstance(e, ConnectionClosed):
+                    # Server restart or network drop: resubscribe, then resync
+                    # below since events may have been missed while away
+                    ws = reconnect_game_ws(game_id)
+                # Quiet for a while; resync over HTTP in case an event was missed.
+                # Mostly an empty 304, and checked less often while nothing changes
+                g = api.get_game(game_id)
+                if g is last:
+                    idle = min(idle * 1.5, IDLE_MAX)
+                else:
+                    last, idle = g, IDLE_MIN
+                    board, status = board_from_fen(g["fen"]), g["status"]
+                continue
+
+            idle = IDLE_MIN
+
+            # Chat, or a move our board already includes
+            if data.get("type") != "move" or data["ply"] < board.ply():
+                continue
+
+            if data["ply"] == board.ply():
+                try:
+                    board.push_uci(data["uci"])
+                except ValueError:
+                    board = board_from_fen(data["fen"])
+            else:
+                # Missed a move somewhere: rebuild from the server's FEN
+                board = board_from_fen(data["fen"])
+            status = data["status"]
+            last = data
+    finally:
+        ws.close()
+
+    # Move events carry the result; only older servers need the extra GET
+    if "result" not in last:
+        last = api.get_game(game_id)
+    print("Game ended:", last.get("result"), last.get("end_reason"))
 
 
 if __name__ == "__main__":
@@ -1,87 +1,74 @@
-import httpx
+from chess_arena.packages.clientlib import APIClientBase
 
 
-class APIClient:
+class APIClient(APIClientBase):
     def __init__(self, base_url: str):
-        self.base_url = base_url.rstrip("/")
-        self.token: str | None = None
-        self.player_id: int | None = None
-        self.name: str | None = None
-
-    # ------------- helpers -------------
-
-    def _auth_headers(self) -> dict:
-        if self.token:
-            return {"Authorization": f"Bearer {self.token}"}
-        return {}
-
-    def _raise(self, r: httpx.Response):
-        try:
-            r.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            raise httpx.HTTPStatusError(
-                f"{e} | response={r.text}",
-                request=e.request,
-                response=e.response,
-            )
+        super().__init__(base_url)
+        self._games: dict[int, tuple[str, dict]] = {}  # game_id -> (etag, state)
 
     # ------------- auth -------------
 
     def bot_login(self, api_key: str):
+        path = self._token_path(api_key)
+        cached = self._load_login(path)
+        if cached:
+            return cached
+
         # Server expects Header(...): x-api-key (case-insensitive)
-        r = httpx.post(
-            f"{self.base_url}/auth/bot/login",
+        r = self._client.post(
+            "/auth/bot/login",
             headers={"X-API-Key": api_key},
-            timeout=30,
         )
         self._raise(r)
 
         data = r.json()
-        self.token = data.get("token")
+        self._set_token(data.get("token"))
         self.player_id = data.get("player_id")
         self.name = data.get("name")
+        self._save_login(path, data)
         return data
 
     # ------------- matchmaking / games -------------
 
-    def queue(self, ranked: bool = True, vs_system: bool = False):
-        # Token identity is source of truth now; DO NOT send player_id
-        r = httpx.post(
-            f"{self.base_url}/matchmaking/queue",
-            json={"ranked": ranked, "vs_system": vs_system},
-            headers=self._auth_headers(),
-            timeout=30,
+    def queue_and_wait(self, ranked: bool = True, vs_system: bool = False, timeout: float = 60):
+        # Queue + wait for the match + initial game state, in one request
+        r = self._post_json(
+            "/matchmaking/play",
+            {"ranked": ranked, "vs_system": vs_system, "timeout": timeout},
+            timeout=timeout + 5,
         )
         self._raise(r)
         return r.json()
 
     def get_game(self, game_id: int):
-        r = httpx.get(
-            f"{self.base_url}/games/{game_id}",
-            headers=self._auth_headers(),
-            timeout=30,
-        )
+        # Conditional GET: an unchanged game comes back as an empty 304
+        cached = self._games.get(game_id)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        r = self._client.get(f"/games/{game_id}", headers=headers)
+        if r.status_code == 304 and cached:
+            return cached[1]
         self._raise(r)
-        return r.json()
+
+        data = r.json()
+        etag = r.headers.get("ETag")
+        if etag:
+            self._games[game_id] = (etag, data)
+        return data
 
     def move(self, game_id: int, uci: str):
         # Token identity is source of truth now; DO NOT send player_id
-        r = httpx.post(
-            f"{self.base_url}/games/{game_id}/move",
-            json={"uci": uci},
-            headers=self._auth_headers(),
-            timeout=30,
+        r = self._post_json(
+            f"/games/{game_id}/move",
+            {"uci": uci},
         )
         self._raise(r)
         return r.json()
 
     def chat(self, game_id: int, text: str):
         # Token identity is source of truth now; DO NOT send player_id
-        r = httpx.post(
-            f"{self.base_url}/games/{game_id}/chat",
-            json={"text": text},
-            headers=self._auth_headers(),
-            timeout=30,
+        r = self._post_json(
+            f"/games/{game_id}/chat",
+            {"text": text},
         )
         self._raise(r)
         return r.json()
@@ -1,41 +1,54 @@
+import json
 import os
-import httpx
+import time
+from typing import Any, Callable
 
+from chess_arena.packages.clientlib import TOKEN_DIR, APIClientBase
 
-class APIClient:
+
+# Seconds a response may be reused for
+ME_TTL = 30.0
+GAME_TTL = 0.5
+
+
+class APIClient(APIClientBase):
     def __init__(self, base_url: str | None = None):
-        self.base_url = (
+        super().__init__(
             base_url
             or os.environ.get("CHESS_ARENA_URL")
             or "http://127.0.0.1:8001"
-        ).rstrip("/")
-
-        self.token: str | None = None
-        self.player_id: int | None = None
-        self.name: str | None = None
+        )
+        self._cache: dict[tuple, tuple[float, Any]] = {}
 
     # ----------------- helpers -----------------
 
-    def _auth_headers(self) -> dict:
-        """Return Authorization header with Bearer token."""
-        if self.token:
-            return {"Authorization": f"Bearer {self.token}"}
-        return {}
+    def _set_token(self, token: str | None):
+        self._cache.clear()
+        super()._set_token(token)
+
+    def _cached(self, key: tuple, ttl: float, fetch: Callable[[], Any]) -> Any:
+        """Return a response fetched less than `ttl` seconds ago, else fetch it."""
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit and now - hit[0] < ttl:
+            return hit[1]
+        data = fetch()
+        self._cache[key] = (now, data)
+        return data
+
+    def invalidate_me(self):
+        """Drop the cached /players/me (e.g. after a game changed the rating)."""
+        self._cache.pop(("me",), None)
 
-    def _raise(self, r: httpx.Response):
-        """Raise HTTPStatusError with response body."""
-        try:
-            r.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            raise httpx.HTTPStatusError(
-                f"{e} | response={r.text}",
-                request=e.request,
-                response=e.response,
-            )
+    def invalidate_game(self, game_id: int):
+        """Drop a cached game state (e.g. when a move event arrives)."""
+        self._cache.pop(("game", game_id, False), None)
+        self._cache.pop(("game", game_id, True), None)
 
     def logout(self):
         """Clear authentication state."""
-        self.token = None
+        self._forget_login()
+        self._set_token(None)
         self.player_id = None
         self.name = None
 
@@ -43,62 +56,84 @@ class APIClient:
 
     def register(self, email: str, name: str, password: str, is_bot: bool = False):
         """Register a new account."""
-        r = httpx.post(
-            f"{self.base_url}/auth/register",
-            json={
+        r = self._post_json(
+            "/auth/register",
+            {
                 "email": email,
                 "name": name,
                 "password": password,
                 "is_bot": is_bot,
             },
-            timeout=30,
         )
         self._raise(r)
 
         data = r.json()
-        self.token = data.get("token")
+        self._set_token(data.get("token"))
         self.player_id = data.get("player_id")
         self.name = data.get("name")
         return data
 
+    def restore_login(self) -> dict | None:
+        """Silent login at startup: the newest cached, unexpired token for this server."""
+        try:
+            paths = sorted(TOKEN_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        except OSError:
+            return None
+        for path in paths:
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            if data.get("base_url") == self.base_url:
+                return self._load_login(path)
+        return None
+
     def login(self, email: str, password: str):
-        """Login with email and password."""
-        r = httpx.post(
-            f"{self.base_url}/auth/login",
-            json={"email": email, "password": password},
-            timeout=30,
+        """Login with email and password; always checked by the server."""
+        path = self._token_path(email.strip().lower())
+        r = self._post_json(
+            "/auth/login",
+            {"email": email, "password": password},
         )
         self._raise(r)
 
         data = r.json()
-        self.token = data.get("token")
+        self._set_token(data.get("token"))
         self.player_id = data.get("player_id")
         self.name = data.get("name")
+        self._save_login(path, data, base_url=self.base_url)
         return data
 
     # ----------------- player -----------------
 
     def me(self):
-        """Get current player info."""
-        r = httpx.get(
-            f"{self.base_url}/players/me",
-            headers=self._auth_headers(),
-            timeout=30,
-        )
-        self._raise(r)
-
-        data = r.json()
+        """Get current player info (cached for ME_TTL seconds)."""
+        data = self._cached(("me",), ME_TTL, lambda: self._get_json("/players/me"))
         # Keep local cache in sync
         self.player_id = data.get("id", self.player_id)
         self.name = data.get("name", self.name)
         return data
 
+    def get_player(self, player_id: int) -> dict:
+        """Public info (id, name, rating, is_bot) for one player."""
+        return self._get_json(f"/players/{player_id}")
+
+    def leaderboard(self, limit: int = 10) -> list[dict]:
+        """Top players by rating."""
+        return self._get_json("/players/leaderboard", {"limit": limit})
+
+    def get_players(self, player_ids: list[int]) -> list[dict]:
+        """Public info (id, name, rating, is_bot) for several players in one request."""
+        r = self._post_json("/players/batch", list(player_ids))
+        self._raise(r)
+        return r.json()
+
     # ----------------- matchmaking / games -----------------
 
     def queue(self, ranked: bool, vs_system: bool):
         """
         Queue for matchmaking using token authentication.
-        
+
         Returns:
         {
             "status": "active" | "waiting",
@@ -107,43 +142,60 @@ class APIClient:
             "vs_system": bool
         }
         """
-        r = httpx.post(
-            f"{self.base_url}/matchmaking/queue",
-            json={"ranked": ranked, "vs_system": vs_system},
-            headers=self._auth_headers(),
-            timeout=30,
+        r = self._post_json(
+            "/matchmaking/queue",
+            {"ranked": ranked, "vs_system": vs_system},
         )
         self._raise(r)
         return r.json()
 
-    def get_game(self, game_id: int):
-        """Get game state."""
-        r = httpx.get(
-            f"{self.base_url}/games/{game_id}",
-            headers=self._auth_headers(),
-            timeout=30,
+    def cancel_queue(self):
+        """Leave the matchmaking queue."""
+        r = self._client.post("/matchmaking/cancel")
+        self._raise(r)
+        return r.json()
+
+    def waiting_players(self, ranked: bool | None = None) -> list[dict]:
+        """Players currently in the matchmaking queue."""
+        params = {"ranked": str(ranked).lower()} if ranked is not None else None
+        return self._get_json("/matchmaking/waiting", params)
+
+    def get_game(self, game_id: int, include_players: bool = False):
+        """Get game state (cached for GAME_TTL seconds); optionally with both players' info."""
+        params = {"include_players": "true"} if include_players else None
+        return self._cached(
+            ("game", game_id, include_players), GAME_TTL,
+            lambda: self._get_json(f"/games/{game_id}", params),
         )
+
+    def _get_json(self, path: str, params: dict | None = None):
+        r = self._client.get(path, params=params)
         self._raise(r)
         return r.json()
 
     def move(self, game_id: int, uci: str):
         """Make a move using token authentication."""
-        r = httpx.post(
-            f"{self.base_url}/games/{game_id}/move",
-            json={"uci": uci},
-            headers=self._auth_headers(),
-            timeout=30,
+        self.invalidate_game(game_id)
+        r = self._post_json(
+            f"/games/{game_id}/move",
+            {"uci": uci},
         )
         self._raise(r)
         return r.json()
 
     def chat(self, game_id: int, text: str):
         """Send chat message using token authentication."""
-        r = httpx.post(
-            f"{self.base_url}/games/{game_id}/chat",
-            json={"text": text},
-            headers=self._auth_headers(),
-            timeout=30,
+        r = self._post_json(
+            f"/games/{game_id}/chat",
+            {"text": text},
         )
         self._raise(r)
-        return r.json()
\ No newline at end of file
+        return r.json()
+
+    # ----------------- lobby -----------------
+
+    def lobby_chat(self, text: str):
+        """Post a message to the lobby chat."""
+        r = self._post_json("/lobby/chat", {"text": text})
+        self._raise(r)
+        return r.json()
@@ -1,6 +1,176 @@
-import json
+import asyncio
 import threading
-import websocket  # NOTE: we avoid extra deps by using websockets in python, but PySide threading is easier with websocket-client
+from typing import Callable
 
-# We won't add websocket-client to requirements by default. Instead we use `websockets` in a thread in game_window.
-# This module remains as a placeholder for future improvements.
+import msgpack
+import orjson
+
+try:
+    # Faster event loop for the bus thread; optional, and not on Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def ws_base(http_base: str) -> str:
+    return http_base.replace("http://", "ws://").replace("https://", "wss://")
+
+
+def decode_frame(msg: bytes | str) -> dict:
+    # msgpack once negotiated; a JSON object frame always starts with "{"
+    if isinstance(msg, bytes) and msg[:1] != b"{":
+        return msgpack.unpackb(msg)
+    return orjson.loads(msg)
+
+
+class WSBus:
+    """
+    One WebSocket per server, shared by every open game.
+
+    Games are (un)subscribed with {"op": "sub"|"unsub", "game_id": N} frames
+    on the server's multiplexed /games/ws endpoint, and each event is routed
+    to its game's callback by `game_id`.
+
+    The bus runs its own asyncio loop on a daemon thread; callbacks are
+    called on that thread, so Qt code should hop to the GUI thread with a
+    signal. Events arrive as msgpack (asked for right after connecting).
+    After a dropped connection is re-established every subscriber
+    gets a {"type": "reconnect"} event, since moves may have been missed.
+    """
+
+    _instances: dict[str, "WSBus"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, base_url: str):
+        self.url = f"{ws_base(base_url)}/games/ws"
+        self._subs: dict[int, Callable[[dict], None]] = {}
+        self._ws = None
+        self._task: asyncio.Task | None = None
+
+        self.loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="ws-bus", daemon=True).start()
+
+    @classmethod
+    def instance(cls, base_url: str) -> "WSBus":
+        key = base_url.rstrip("/")
+        with cls._lock:
+            bus = cls._instances.get(key)
+            if bus is None:
+                bus = cls._instances[key] = cls(key)
+            return bus
+
+    # ------------- public (any thread) -------------
+
+    def subscribe(self, game_id: int, callback: Callable[[dict], None]):
+        self.loop.call_soon_threadsafe(self._subscribe, game_id, callback)
+
+    def unsubscribe(self, game_id: int):
+        self.loop.call_soon_threadsafe(self._unsubscribe, game_id)
+
+    def close(self, timeout: float = 2.0):
+        """Close the socket and stop the bus thread (e.g. on app exit)."""
+        if self.loop.is_closed() or not self.loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close(), self.loop).result(timeout)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            buses = list(cls._instances.values())
+            cls._instances.clear()
+        for bus in buses:
+            bus.close()
+
+    # ------------- bus loop -------------
+
+    def _subscribe(self, game_id: int, callback: Callable[[dict], None]):
+        self._subs[game_id] = callback
+        if self._task is None:
+            self._task = self.loop.create_task(self._run())
+        elif self._ws is not None:
+            self.loop.create_task(self._send({"op": "sub", "game_id": game_id}))
+
+    def _unsubscribe(self, game_id: int):
+        if self._subs.pop(game_id, None) is None or self._ws is None:
+            return
+        if self._subs:
+            self.loop.create_task(self._send({"op": "unsub", "game_id": game_id}))
+        else:
+            # Last game closed: drop the connection until the next subscribe
+            self.loop.create_task(self._ws.close())
+
+    async def _close(self):
+        self._subs.clear()
+        if self._ws is not None:
+            await self._ws.close()
+        if self._task is not None:
+            # Also ends a pending reconnect sleep
+            self._task.cancel()
+
+    async def _send(self, msg: dict):
+        try:
+            await self._ws.send(orjson.dumps(msg).decode())
+        except Exception:
+            pass  # the reconnect path resubscribes everything
+
+    @staticmethod
+    def _dispatch(callback: Callable[[dict], None], data: dict):
+        # A failing subscriber (e.g. a window torn down mid-event) must not
+        # drop the socket every other game shares
+        try:
+            callback(data)
+        except Exception:
+            pass
+
+    async def _run(self):
+        # Imported on first subscribe, so start-up (menus, lobby) doesn't pay for it
+        import websockets
+
+        delay = 0.5
+        connected_before = False
+
+        while self._subs:
+            try:
+                # Frames are tiny move/chat events: skip per-message deflate
+                async with websockets.connect(
+                    self.url,
+                    compression=None,
+                    ping_interval=20,
+                    ping_timeout=20,
+                    max_size=1 << 20,
+                    # Bot move chains arrive in bursts; buffer them rather than
+                    # pausing the socket read while callbacks run
+                    max_queue=64,
+                ) as ws:
+                    self._ws = ws
+                    delay = 0.5
+
+                    # Sent before any sub, so every event already comes packed
+                    await ws.send(orjson.dumps({"codec": "msgpack"}).decode())
+                    for game_id in list(self._subs):
+                        await ws.send(orjson.dumps({"op": "sub", "game_id": game_id}).decode())
+
+                    if connected_before:
+                        for game_id, callback in list(self._subs.items()):
+                            self._dispatch(callback, {"type": "reconnect", "game_id": game_id})
+                    connected_before = True
+
+                    async for msg in ws:
+                        data = decode_frame(msg)
+                        callback = self._subs.get(data.get("game_id"))
+                        if callback:
+                            self._dispatch(callback, data)
+            except Exception:
+                pass
+            finally:
+                self._ws = None
+
+            if self._subs:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 10)
+
+        self._task = None
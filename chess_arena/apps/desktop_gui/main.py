@@ -5,7 +5,14 @@ from PySide6.QtWidgets import QApplication
 
 from chess_arena.apps.desktop_gui.client.api_client import APIClient
 from chess_arena.apps.desktop_gui.ui.start_menu import StartMenu
-from chess_arena.apps.desktop_gui.ui.theme import APP_QSS
+from chess_arena.apps.desktop_gui.ui.theme import install_theme
+
+
+def _close_sockets():
+    # The socket module is only loaded once a game opens; nothing to close before that
+    ws_client = sys.modules.get("chess_arena.apps.desktop_gui.client.ws_client")
+    if ws_client:
+        ws_client.WSBus.close_all()
 
 
 def main():
@@ -14,10 +21,15 @@ def main():
 
     # Create Qt app first, then apply theme
     app = QApplication(sys.argv)
-    app.setStyleSheet(APP_QSS)
+    install_theme(app)
 
     # Create API client once
     api = APIClient(base_url)
+    app.aboutToQuit.connect(api.close)
+    # A still-valid login from last time skips the login screen
+    api.restore_login()
+    # Close game sockets cleanly instead of dropping them with the daemon thread
+    app.aboutToQuit.connect(_close_sockets)
 
     # Show start menu
     w = StartMenu(api)
@@ -1,30 +1,50 @@
 # game_window.py - Enhanced Game Window
 
-import asyncio
 import threading
-import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
 import chess
-import websockets
 
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QLabel, QMessageBox, 
     QFrame, QPushButton, QSizePolicy
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QThreadPool, QTimer
 
+from ..client.ws_client import WSBus
+from .workers import Call
 from .widgets.chess_board_widget import ChessBoardWidget
 from .widgets.chat_widget import ChatWidget
 from .widgets.move_history_widget import MoveHistoryWidget
 
 
-def ws_url(http_base: str, game_id: int) -> str:
-    base = http_base.replace("http://", "ws://").replace("https://", "wss://")
-    return f"{base}/games/ws/{game_id}"
+# Fans out independent requests inside a refresh (HTTP/2 multiplexes them)
+_FANOUT = ThreadPoolExecutor(max_workers=4, thread_name_prefix="api-fanout")
+
+
+_TURN_TEXT = {"mine": "Your Turn!", "theirs": "Opponent's Turn", "over": "Game Over"}
+
+
+def _state_key(g: dict) -> tuple:
+    """What a game state renders from; equal keys mean nothing to redraw."""
+    return (g.get("fen"), g.get("pgn"), g.get("status"), g.get("white_id"), g.get("black_id"), g.get("result"))
 
 
 class PlayerInfoWidget(QFrame):
     """Displays player information with name, rating, and status."""
     
+    # Built once; set_turn only swaps between them
+    _QSS_INDICATOR = {
+        "white": "font-size: 16px; color: #ffffff;",
+        "black": "font-size: 16px; color: #1a1a1a;",
+    }
+    _QSS_THEIR_TURN = (
+        "padding: 4px 10px; border-radius: 4px; font-size: 11px; font-weight: 600;"
+        " background: #2d6a4f; color: #ffffff;"
+    )
+    _QSS_IDLE = "padding: 4px 10px; border-radius: 4px; font-size: 11px; font-weight: 600;"
+    
     def __init__(self, color: str, parent=None):
         super().__init__(parent)
         self.color = color  # 'white' or 'black'
@@ -36,18 +56,18 @@ class PlayerInfoWidget(QFrame):
         
         # Color indicator
         indicator = QLabel("●")
-        indicator.setStyleSheet(f"""
-            font-size: 16px;
-            color: {'#ffffff' if color == 'white' else '#1a1a1a'};
-        """)
+        indicator.setStyleSheet(self._QSS_INDICATOR[color])
         layout.addWidget(indicator)
         
         # Player info
         info_layout = QVBoxLayout()
         info_layout.setSpacing(2)
         
-        self.name_label = QLabel("Waiting...")
+        self._shown_name = "Waiting..."
+        self._shown_rating = ""
+        self.name_label = QLabel(self._shown_name)
         self.name_label.setObjectName("PlayerName")
+        self.name_label.setTextFormat(Qt.PlainText)
         info_layout.addWidget(self.name_label)
         
         self.rating_label = QLabel("")
@@ -59,41 +79,40 @@ class PlayerInfoWidget(QFrame):
         
         # Turn indicator
         self.turn_indicator = QLabel("")
-        self.turn_indicator.setStyleSheet("""
-            padding: 4px 10px;
-            border-radius: 4px;
-            font-size: 11px;
-            font-weight: 600;
-        """)
+        self.turn_indicator.setStyleSheet(self._QSS_IDLE)
+        self._their_turn = False
         layout.addWidget(self.turn_indicator)
     
     def set_player(self, name: str, rating: int, is_you: bool = False):
         display_name = f"{name} (You)" if is_you else name
-        self.name_label.setText(display_name)
-        self.rating_label.setText(f"Rating: {rating:.0f}")
+        rating_text = f"Rating: {rating:.0f}"
+        # setText relayouts even for identical text
+        if display_name != self._shown_name:
+            self._shown_name = display_name
+            self.name_label.setText(display_name)
+        if rating_text != self._shown_rating:
+            self._shown_rating = rating_text
+            self.rating_label.setText(rating_text)
     
     def set_turn(self, is_their_turn: bool):
-        if is_their_turn:
-            self.turn_indicator.setText("● Their turn")
-            self.turn_indicator.setStyleSheet("""
-                padding: 4px 10px;
-                border-radius: 4px;
-                font-size: 11px;
-                font-weight: 600;
-                background: #2d6a4f;
-                color: #ffffff;
-            """)
-        else:
-            self.turn_indicator.setText("")
-            self.turn_indicator.setStyleSheet("padding: 4px 10px;")
+        if is_their_turn == self._their_turn:
+            return  # called on every render; only restyle on a change
+        self._their_turn = is_their_turn
+        self.turn_indicator.setText("● Their turn" if is_their_turn else "")
+        self.turn_indicator.setStyleSheet(self._QSS_THEIR_TURN if is_their_turn else self._QSS_IDLE)
 
 
 class GameWindow(QWidget):
     """Main game window with board, chat, and move history."""
     
     # Thread-safe signals for websocket updates
-    wsChat = Signal(str)
-    wsMove = Signal()
+    wsChatBatch = Signal()  # chat lines are waiting in _chat_pending
+    wsMove = Signal(object)  # move event dict
+    wsResync = Signal()
+    stateLoaded = Signal(object)  # game dict from a background refresh
+    loadFailed = Signal(str)
+    apiError = Signal(str)  # failed background move/chat, shown in chat
+    moveRejected = Signal(str)  # uci of an optimistic move the server refused
     
     def __init__(self, api, game_id: int, parent=None):
         super().__init__(parent)
@@ -104,25 +123,53 @@ class GameWindow(QWidget):
         
         self.selected: str | None = None
         self.current_fen: str = "startpos"
+        self._board = chess.Board()  # kept in step with the game, move by move
         self.current_pgn: str = ""
         self._legal_to: set[str] = set()
+        self._legal_by_from: dict[int, frozenset[str]] | None = None  # per position; indexed when idle on our turn
+        self._pending: tuple[int, str] | None = None  # (ply, uci) played locally, not yet confirmed
+        self._game: dict = {}  # last known game state
+        self._last_state_key: tuple | None = None  # _state_key of self._game
+        # Chat lines from the bus thread, drained on the GUI thread in one go
+        self._chat_lock = threading.Lock()
+        self._chat_pending: list[str] = []
+        # What's on screen, so identical states (duplicate pushes) repaint nothing
+        self._last_rendered_fen: str | None = None
+        self._last_rendered_pgn: str | None = None
+        self._last_status_text: str | None = None
+        self._last_turn_state: str | None = None
         
         # Player info cache
         self.white_info = None
         self.black_info = None
+        self._seats = None  # (white_id, black_id) the panels were filled for
+        self._me_cache: dict | None = None
+        self._player_cache: dict[int, dict] = {}
         self.my_id = None
         self.my_color = None
         
+        # Bursts of events (bot move chains, reconnects) collapse into one
+        # render / one refresh
+        self._render_timer = QTimer(self, singleShot=True)
+        self._render_timer.timeout.connect(self._render_state)
+        self._refresh_timer = QTimer(self, singleShot=True)
+        self._refresh_timer.timeout.connect(self.refresh)
+        
         self._setup_ui()
         self._connect_signals()
         
         # Initial load
         self.refresh()
         
-        # Websocket thread
-        self._stop = False
-        self._ws_thread = threading.Thread(target=self._ws_loop, daemon=True)
-        self._ws_thread.start()
+        # Events arrive over the one socket shared by all games; one lookup per frame
+        self._closed = False
+        self._ws_handlers = {
+            "chat": self._on_ws_chat,
+            "move": self.wsMove.emit,  # rendered on the GUI thread from the payload itself
+            "reconnect": self._on_ws_reconnect,
+        }
+        self._bus = WSBus.instance(self.api.base_url)
+        self._bus.subscribe(self.game_id, self._on_ws_event)
     
     def _setup_ui(self):
         root = QHBoxLayout(self)
@@ -210,79 +257,223 @@ class GameWindow(QWidget):
     def _connect_signals(self):
         self.board.squareClicked.connect(self.on_square_clicked)
         self.chat.sendChat.connect(self.send_chat)
-        self.wsChat.connect(self._handle_ws_chat)
-        self.wsMove.connect(self.refresh)
+        self.wsChatBatch.connect(self._flush_ws_chat)
+        self.wsMove.connect(self._apply_ws_move)
+        self.wsResync.connect(lambda: self._refresh_timer.start(20))
+        self.stateLoaded.connect(self._on_state_loaded)
+        self.loadFailed.connect(self._on_load_failed)
+        self.apiError.connect(self.chat.append_system)
+        self.moveRejected.connect(self._rollback_move)
     
-    def _handle_ws_chat(self, msg: str):
-        self.chat.append(msg)
+    def _flush_ws_chat(self):
+        with self._chat_lock:
+            lines, self._chat_pending = self._chat_pending, []
+        self.chat.append_many(lines)
     
     # ---------- Helpers ----------
-    def _board_obj(self) -> chess.Board:
-        fen = self.current_fen
-        if not fen or fen == "startpos":
-            return chess.Board()
-        return chess.Board(fen)
+    def _legal_targets(self, from_square: int) -> frozenset[str]:
+        """Destination squares from one square; memoized per position."""
+        if self._legal_by_from is None:
+            self._legal_by_from = {}
+        targets = self._legal_by_from.get(from_square)
+        if targets is None:
+            board = self._board
+            if not board.occupied_co[board.turn] & chess.BB_SQUARES[from_square]:
+                return frozenset()  # only the side to move has legal moves
+            # from_mask makes python-chess enumerate just this square's moves
+            moves = board.generate_legal_moves(from_mask=chess.BB_SQUARES[from_square])
+            targets = self._legal_by_from[from_square] = frozenset(chess.square_name(mv.to_square) for mv in moves)
+        return targets
+    
+    def _index_legal_moves(self):
+        """Group every legal move by origin in one pass, while idle on our turn."""
+        if self._legal_by_from:
+            return  # a click already started this position's index
+        by_from: dict[int, set[str]] = {}
+        for mv in self._board.legal_moves:
+            by_from.setdefault(mv.from_square, set()).add(chess.square_name(mv.to_square))
+        self._legal_by_from = {sq: frozenset(targets) for sq, targets in by_from.items()}
     
     def _clear_selection_ui(self):
         self.selected = None
-        self._legal_to.clear()
+        self._legal_to = set()
         self.board.clear_highlights()
     
-    def _fetch_player_info(self, player_id: int) -> dict:
-        """Fetch player info from API."""
+    def _fetch_players(self, player_ids) -> None:
+        """Fill the player cache for any ids not in it yet, in one batched request."""
+        missing = [pid for pid in player_ids if pid and pid not in self._player_cache]
+        if not missing:
+            return
         try:
-            # Try to get player info - adjust endpoint as needed
-            import httpx
-            r = httpx.get(f"{self.api.base_url}/players/{player_id}", timeout=5)
-            if r.status_code == 200:
-                return r.json()
-        except:
-            pass
-        return {"name": f"Player #{player_id}", "rating": 1500}
+            for info in self.api.get_players(missing):
+                self._player_cache[info["id"]] = info
+        except Exception:
+            pass  # panels fall back to "Player #id"
     
     # ---------- UI actions ----------
     def refresh(self):
+        """Full reload over HTTP (initial load, reconnect), fetched off the GUI thread."""
+        QThreadPool.globalInstance().start(Call(self._load_state))
+    
+    def _load_state(self):
+        """Worker thread: all the HTTP for a refresh; hands the result to the GUI thread."""
         try:
-            g = self.api.get_game(self.game_id)
-            me = self.api.me()
-            self.my_id = me.get("id")
+            me = None
+            if self._me_cache is None:
+                if self.api.player_id is not None:
+                    # Identity is known since login; seat info covers name and rating
+                    self._me_cache = {"id": self.api.player_id, "name": self.api.name}
+                else:
+                    # /players/me runs alongside the game fetch
+                    me = _FANOUT.submit(self.api.me)
+            g = self.api.get_game(self.game_id, include_players=True)
+            if me is not None:
+                self._me_cache = me.result()
+            if _state_key(g) == self._last_state_key:
+                return  # e.g. a reconnect resync with nothing missed
+            my_id = self._me_cache.get("id")
             
-            white_id = g.get("white_id")
-            black_id = g.get("black_id")
+            # Seat info piggy-backs on the game response
+            for side in ("white", "black"):
+                info = g.get(side)
+                if info:
+                    self._player_cache[info["id"]] = info
+            self._fetch_players(
+                pid for pid in (g.get("white_id"), g.get("black_id")) if pid != my_id
+            )
             
-            # Determine my color
-            if self.my_id == white_id:
-                self.my_color = "white"
-            elif self.my_id == black_id:
-                self.my_color = "black"
-            else:
-                self.my_color = "spectator"
+            self.stateLoaded.emit(g)
+        except Exception as e:
+            self.loadFailed.emit(str(e))
+    
+    def _on_state_loaded(self, g: dict):
+        me = self._me_cache
+        self.my_id = me.get("id")
+        
+        white_id = g.get("white_id")
+        black_id = g.get("black_id")
+        
+        # Determine my color
+        if self.my_id == white_id:
+            self.my_color = "white"
+        elif self.my_id == black_id:
+            self.my_color = "black"
+        else:
+            self.my_color = "spectator"
+        
+        with self._batched_updates():
+            # Update player info panels; names/ratings don't change mid-game,
+            # so only when the seats do (i.e. once per game)
+            if (white_id, black_id) != self._seats:
+                self._seats = (white_id, black_id)
+                self.white_info = self._seat_info(white_id, me)
+                self.white_player.set_player(self.white_info.get("name", f"#{white_id}"), self.white_info.get("rating", 1500),
+                                             is_you=white_id == self.my_id)
+                self.black_info = self._seat_info(black_id, me)
+                self.black_player.set_player(self.black_info.get("name", f"#{black_id}"), self.black_info.get("rating", 1500),
+                                             is_you=black_id == self.my_id)
             
-            meta = g.get("meta", {})
-            turn = meta.get("turn")
+            self._apply_state(dict(g))
+    
+    @contextmanager
+    def _batched_updates(self):
+        """Suppress repaints while several widgets change; one paint pass afterwards."""
+        if not self.updatesEnabled():
+            yield  # already inside a batch
+            return
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+    
+    def _seat_info(self, player_id: int | None, me: dict) -> dict:
+        if not player_id:
+            return {"name": "Waiting...", "rating": 0}
+        info = self._player_cache.get(player_id)
+        if info:
+            return info
+        if player_id == self.my_id:
+            return {"name": me.get("name", "You"), "rating": me.get("rating", 1500)}
+        return {"name": f"Player #{player_id}", "rating": 1500}
+    
+    def _on_load_failed(self, err: str):
+        QMessageBox.critical(self, "Error", err)
+    
+    def _apply_ws_move(self, data: dict):
+        """Apply a `move` event's state without another HTTP round-trip."""
+        if self._pending is None and _state_key({**self._game, **data}) == self._last_state_key:
+            return  # duplicate push
+        self.api.invalidate_game(self.game_id)
+        if data.get("status") == "ended":
+            self.api.invalidate_me()  # the rating just changed
+        self._game.update(
+            (k, data[k]) for k in ("fen", "pgn", "status", "result", "end_reason") if k in data
+        )
+        
+        # Play the move onto the live board when it follows on from it
+        uci = data.get("uci")
+        if self._pending is not None and self._pending == (data.get("ply"), uci):
+            # Our own move, already on the board
+            self._pending = None
+            in_step = True
+        else:
+            if self._pending is not None:
+                self._pending = None
+                self._board.pop()
+            in_step = bool(uci) and data.get("ply") == self._board.ply()
+            if in_step:
+                try:
+                    self._board.push_uci(uci)
+                except ValueError:
+                    in_step = False
+        
+        # Events carry the move's SAN, not the whole PGN
+        if "pgn" not in data:
+            if in_step and data.get("san"):
+                self._game["pgn"] = self._game.get("pgn", "") + data["san"] + " "
+            else:
+                self._refresh_timer.start(20)  # missed a move: fetch the full PGN
+        self._apply_state(self._game, board_in_step=in_step, defer_render=True)
+    
+    def _apply_state(self, g: dict, board_in_step: bool = False, defer_render: bool = False):
+        """Take in a game state dict, then render it (now or after a 20 ms quiet spell)."""
+        self._game = g
+        self._last_state_key = _state_key(g)
+        self.current_fen = g.get("fen", "startpos")
+        self.current_pgn = g.get("pgn", "")
+        if not board_in_step:
+            # Bootstrap / out-of-order event: rebuild from the FEN
+            self._pending = None
+            fen = self.current_fen
+            self._board = chess.Board() if not fen or fen == "startpos" else chess.Board(fen)
+        self._legal_by_from = None
+        
+        if defer_render:
+            # Restarting the timer folds a burst of events into one render
+            self._render_timer.start(20)
+        else:
+            self._render_timer.stop()
+            self._render_state()
+    
+    def _render_state(self):
+        """Render board, moves, turn and status from the current state."""
+        with self._batched_updates():
+            g = self._game
+            board = self._board
+            fen = board.fen()
+            if fen != self._last_rendered_fen:
+                self._last_rendered_fen = fen
+                self.board.set_board(board)
             
-            # Update cached board state + render
-            self.current_fen = g.get("fen", "startpos")
-            self.current_pgn = g.get("pgn", "")
-            self.board.set_fen(self.current_fen)
+            # Turn / check are derived locally; the server no longer sends meta
+            turn = "white" if board.turn else "black"
             
             # Update move history
-            self.move_history.set_pgn(self.current_pgn)
-            
-            # Update player info panels
-            # White player
-            if white_id == self.my_id:
-                self.white_player.set_player(me.get("name", "You"), me.get("rating", 1500), is_you=True)
-            else:
-                white_info = self._fetch_player_info(white_id) if white_id else {"name": "Waiting...", "rating": 0}
-                self.white_player.set_player(white_info.get("name", f"#{white_id}"), white_info.get("rating", 1500))
-            
-            # Black player
-            if black_id == self.my_id:
-                self.black_player.set_player(me.get("name", "You"), me.get("rating", 1500), is_you=True)
-            else:
-                black_info = self._fetch_player_info(black_id) if black_id else {"name": "Waiting...", "rating": 0}
-                self.black_player.set_player(black_info.get("name", f"#{black_id}"), black_info.get("rating", 1500))
+            if self.current_pgn != self._last_rendered_pgn:
+                self._last_rendered_pgn = self.current_pgn
+                self.move_history.set_pgn(self.current_pgn)
             
             # Update turn indicators
             self.white_player.set_turn(turn == "white" and self.my_color != "white")
@@ -293,78 +484,54 @@ class GameWindow(QWidget):
             if g.get('ranked'):
                 status_lines.append("Ranked Game")
             
-            if meta.get("in_check"):
+            if board.is_check():
                 status_lines.append("⚠️ CHECK!")
             
             if g.get("result"):
                 status_lines.append(f"Result: {g.get('result')}")
                 status_lines.append(f"Reason: {g.get('end_reason')}")
             
-            self.status_label.setText("\n".join(status_lines))
+            status_text = "\n".join(status_lines)
+            if status_text != self._last_status_text:
+                self._last_status_text = status_text
+                self.status_label.setText(status_text)
             
             # Your turn indicator
             is_my_turn = (turn == self.my_color)
-            if g.get("status") == "active":
-                if is_my_turn:
-                    self.turn_label.setText("Your Turn!")
-                    self.turn_label.setStyleSheet("""
-                        padding: 8px 16px;
-                        border-radius: 6px;
-                        font-size: 14px;
-                        font-weight: 700;
-                        background: #2d6a4f;
-                        color: #ffffff;
-                    """)
-                else:
-                    self.turn_label.setText("Opponent's Turn")
-                    self.turn_label.setStyleSheet("""
-                        padding: 8px 16px;
-                        border-radius: 6px;
-                        font-size: 14px;
-                        font-weight: 600;
-                        background: #1f2a3a;
-                        color: #8fa4bf;
-                    """)
+            if g.get("status") != "active":
+                turn_state = "over"
             else:
-                self.turn_label.setText("Game Over")
-                self.turn_label.setStyleSheet("""
-                    padding: 8px 16px;
-                    border-radius: 6px;
-                    font-size: 14px;
-                    font-weight: 600;
-                    background: #742a2a;
-                    color: #ffffff;
-                """)
+                turn_state = "mine" if is_my_turn else "theirs"
+            if turn_state != self._last_turn_state:
+                self._last_turn_state = turn_state
+                self.turn_label.setText(_TURN_TEXT[turn_state])
+                # Pre-baked selectors in the app QSS; re-polish instead of parsing a stylesheet
+                self.turn_label.setProperty("turn", turn_state)
+                self.turn_label.style().unpolish(self.turn_label)
+                self.turn_label.style().polish(self.turn_label)
+            
+            if turn_state == "mine" and self._legal_by_from is None:
+                # Index moves once the frame is painted, so clicks are plain lookups
+                QTimer.singleShot(0, self._index_legal_moves)
             
             # Clear selection after any refresh
             self._clear_selection_ui()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
     
     def on_square_clicked(self, sq: str):
-        try:
-            board = self._board_obj()
-        except Exception as e:
-            self.chat.append_system(f"FEN error: {e}")
-            self._clear_selection_ui()
-            return
+        # The live board is kept current by _apply_state; no FEN parsing per click
+        board = self._board
+        square = chess.parse_square(sq)
         
         # First click: select a piece square
         if self.selected is None:
-            piece = board.piece_at(chess.parse_square(sq))
-            if piece is None:
+            if board.piece_at(square) is None:
                 return
             
             self.selected = sq
-            frm_sq = chess.parse_square(sq)
-            legal_to = set()
-            for mv in board.legal_moves:
-                if mv.from_square == frm_sq:
-                    legal_to.add(chess.square_name(mv.to_square))
+            legal_to = self._legal_targets(square)
             
             self._legal_to = legal_to
-            self.board.highlight_squares(sq, sorted(legal_to))
+            self.board.highlight_squares(sq, legal_to)
             return
         
         # Second click: destination
@@ -375,25 +542,61 @@ class GameWindow(QWidget):
             self._clear_selection_ui()
             return
         
-        if self._legal_to and to not in self._legal_to:
+        # Any render clears the selection, so _legal_to is for this position
+        if to not in self._legal_to:
             self.chat.append_system(f"Illegal move: {frm}{to}")
             self._clear_selection_ui()
             return
         
         self._clear_selection_ui()
         
-        uci = f"{frm}{to}"
-        try:
-            self.api.move(self.game_id, uci)
-            self.board.set_last_move(frm, to)
-        except Exception as e:
-            self.chat.append_system(f"Move rejected: {e}")
+        if self._pending is not None:
+            return  # one move in flight at a time
+        if self.my_color != ("white" if board.turn else "black"):
+            self.chat.append_system("Not your turn")
+            return
+        
+        from_square = chess.parse_square(frm)
+        move = chess.Move(from_square, square)
+        if board.piece_type_at(from_square) == chess.PAWN and chess.square_rank(square) in (0, 7):
+            move.promotion = chess.QUEEN
+        
+        # Optimistic: show the move now, confirm (or roll back) on the server's answer
+        uci = move.uci()
+        self._pending = (board.ply(), uci)
+        board.push(move)
+        self._legal_by_from = None
+        self._render_state()
+        self.board.set_last_move(frm, to)
+        
+        def send():
+            try:
+                self.api.move(self.game_id, uci)
+            except Exception as e:
+                self.apiError.emit(f"Move rejected: {e}")
+                self.moveRejected.emit(uci)
+        
+        QThreadPool.globalInstance().start(Call(send))
+    
+    def _rollback_move(self, uci: str):
+        """Take back an optimistic move the server refused."""
+        if self._pending is None or self._pending[1] != uci:
+            return  # already replaced by server state
+        self._pending = None
+        self._board.pop()
+        self._legal_by_from = None
+        self.board.set_last_move(None, None)
+        self._render_state()
     
     def send_chat(self, text: str):
-        try:
-            self.api.chat(self.game_id, text)
-        except Exception as e:
-            self.chat.append_system(f"Chat error: {e}")
+        # The message comes back as a WS chat event
+        def send():
+            try:
+                self.api.chat(self.game_id, text)
+            except Exception as e:
+                self.apiError.emit(f"Chat error: {e}")
+        
+        QThreadPool.globalInstance().start(Call(send))
     
     def _on_resign(self):
         reply = QMessageBox.question(
@@ -412,45 +615,27 @@ class GameWindow(QWidget):
         self.chat.append_system("Draw offer sent (not implemented yet)")
     
     def closeEvent(self, event):
-        self._stop = True
+        # Events already queued on the bus thread are dropped from here on
+        self._closed = True
+        self._bus.unsubscribe(self.game_id)
         super().closeEvent(event)
     
-    # ---------- Websocket loop ----------
-    def _ws_loop(self):
-        async def run():
-            url = ws_url(self.api.base_url, self.game_id)
-            try:
-                async with websockets.connect(url) as ws:
-                    async def ping_loop():
-                        while not self._stop:
-                            try:
-                                await ws.send("ping")
-                            except:
-                                break
-                            await asyncio.sleep(10)
-                    
-                    ping_task = asyncio.create_task(ping_loop())
-                    
-                    while not self._stop:
-                        msg = await ws.recv()
-                        
-                        if isinstance(msg, (bytes, bytearray)):
-                            msg = msg.decode("utf-8", errors="ignore")
-                        
-                        data = json.loads(msg)
-                        
-                        if data.get("type") == "chat":
-                            pid = data.get("player_id")
-                            txt = data.get("text")
-                            self.wsChat.emit(f"{pid}: {txt}")
-                        
-                        elif data.get("type") == "move":
-                            self.current_fen = data.get("fen", self.current_fen)
-                            self.current_pgn = data.get("pgn", self.current_pgn)
-                            self.wsMove.emit()
-                    
-                    ping_task.cancel()
-            except Exception as e:
-                self.wsChat.emit(f"[ws closed] {e}")
-        
-        asyncio.run(run())
+    # ---------- Websocket events (bus thread) ----------
+    def _on_ws_event(self, data: dict):
+        if self._closed:
+            return
+        handler = self._ws_handlers.get(data.get("type"))
+        if handler:
+            handler(data)
+    
+    def _on_ws_chat(self, data: dict):
+        with self._chat_lock:
+            self._chat_pending.append(f"{data.get('player_id')}: {data.get('text')}")
+            first = len(self._chat_pending) == 1
+        # One queued signal per burst: later lines ride along until the GUI drains them
+        if first:
+            self.wsChatBatch.emit()
+    
+    def _on_ws_reconnect(self, data: dict):
+        # Events may have been missed while disconnected
+        self.wsResync.emit()
@@ -0,0 +1,22 @@
+# layouts.py - Box layout factories
+
+from PySide6.QtWidgets import QBoxLayout, QHBoxLayout, QVBoxLayout, QWidget
+
+
+def _setup(layout: QBoxLayout, margins, spacing) -> QBoxLayout:
+    # None keeps Qt's default for that setting
+    if margins is not None:
+        layout.setContentsMargins(*margins)
+    if spacing is not None:
+        layout.setSpacing(spacing)
+    return layout
+
+
+def vbox(parent: QWidget | None = None, margins=(16, 16, 16, 16), spacing: int | None = 8) -> QVBoxLayout:
+    """QVBoxLayout with its margins (left, top, right, bottom) and spacing set."""
+    return _setup(QVBoxLayout(parent), margins, spacing)
+
+
+def hbox(parent: QWidget | None = None, margins=(16, 16, 16, 16), spacing: int | None = 8) -> QHBoxLayout:
+    """QHBoxLayout with its margins (left, top, right, bottom) and spacing set."""
+    return _setup(QHBoxLayout(parent), margins, spacing)
@@ -3,19 +3,55 @@
 import threading
 import time
 
+import orjson
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
     QMessageBox, QCheckBox, QFrame, QListWidget, QListWidgetItem,
     QSizePolicy
 )
-from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtCore import Qt, Signal, QThreadPool, QTimer
+from PySide6.QtGui import QColor
 
+from ..client.ws_client import ws_base
+from .workers import Call
 from .widgets.chat_widget import ChatWidget
 
 
+# Leaderboard rank label and colour per row, built once
+_RANK_LABELS = ("🥇", "🥈", "🥉") + tuple(f"#{rank}" for rank in range(4, 11))
+_RANK_COLORS = (QColor("#d4af37"), QColor("#a8a8a8"), QColor("#cd7f32")) + (QColor("#8fa4bf"),) * 7
+
+
+def _sync_list(widget: QListWidget, texts: list[str], colors=None):
+    """Make a list show `texts`, reusing its items; unchanged rows aren't touched.
+
+    `colors` (per row) is applied when a row's item is created.
+    """
+    for row, text in enumerate(texts):
+        item = widget.item(row)
+        if item is None:
+            item = QListWidgetItem(text)
+            if colors:
+                item.setForeground(colors[row])
+            widget.addItem(item)
+        elif item.text() != text:
+            item.setText(text)
+    while widget.count() > len(texts):
+        widget.takeItem(widget.count() - 1)
+
+
 class LeaderboardWidget(QFrame):
     """Top 10 players leaderboard."""
     
+    # Shown when the server can't be reached
+    SAMPLE_PLAYERS = [
+        {"name": "GrandMaster42", "rating": 2150, "wins": 156, "losses": 34},
+        {"name": "ChessWizard", "rating": 2080, "wins": 142, "losses": 48},
+        {"name": "KnightRider", "rating": 1950, "wins": 98, "losses": 52},
+        {"name": "BishopSlayer", "rating": 1890, "wins": 87, "losses": 63},
+        {"name": "RookMaster", "rating": 1820, "wins": 76, "losses": 54},
+    ]
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("LeaderboardPanel")
@@ -47,48 +83,13 @@ class LeaderboardWidget(QFrame):
     
     def set_players(self, players: list[dict]):
         """Set leaderboard data. Each dict has: rank, name, rating, wins, losses"""
-        self.list.clear()
-        
-        for i, player in enumerate(players[:10]):
-            rank = i + 1
-            name = player.get("name", "Unknown")
-            rating = player.get("rating", 1500)
-            wins = player.get("wins", 0)
-            losses = player.get("losses", 0)
-            
-            # Medal for top 3
-            if rank == 1:
-                medal = "🥇"
-                style = "color: #d4af37; font-weight: 700;"
-            elif rank == 2:
-                medal = "🥈"
-                style = "color: #a8a8a8; font-weight: 600;"
-            elif rank == 3:
-                medal = "🥉"
-                style = "color: #cd7f32; font-weight: 600;"
-            else:
-                medal = f"#{rank}"
-                style = "color: #8fa4bf;"
-            
-            item = QListWidgetItem(f"{medal}  {name}  •  {rating:.0f}  ({wins}W/{losses}L)")
-            self.list.addItem(item)
-    
-    def refresh(self, api):
-        """Fetch and update leaderboard from API."""
-        try:
-            import httpx
-            r = httpx.get(f"{api.base_url}/players/leaderboard", timeout=5)
-            if r.status_code == 200:
-                self.set_players(r.json())
-        except:
-            # Fallback sample data
-            self.set_players([
-                {"name": "GrandMaster42", "rating": 2150, "wins": 156, "losses": 34},
-                {"name": "ChessWizard", "rating": 2080, "wins": 142, "losses": 48},
-                {"name": "KnightRider", "rating": 1950, "wins": 98, "losses": 52},
-                {"name": "BishopSlayer", "rating": 1890, "wins": 87, "losses": 63},
-                {"name": "RookMaster", "rating": 1820, "wins": 76, "losses": 54},
-            ])
+        texts = [
+            # Medal for top 3, "#n" below
+            f"{label}  {p.get('name', 'Unknown')}  •  {p.get('rating', 1500):.0f}  "
+            f"({p.get('wins', 0)}W/{p.get('losses', 0)}L)"
+            for label, p in zip(_RANK_LABELS, players)
+        ]
+        _sync_list(self.list, texts, _RANK_COLORS)
 
 
 class WaitingPlayersWidget(QFrame):
@@ -121,33 +122,23 @@ class WaitingPlayersWidget(QFrame):
     
     def set_players(self, players: list[dict]):
         """Update waiting players list."""
-        self.list.clear()
         self.count_label.setText(f"{len(players)} waiting")
         
+        texts = []
         for player in players:
             name = player.get("name", "Unknown")
             rating = player.get("rating", 1500)
             queue_type = "Ranked" if player.get("ranked") else "Free"
-            
-            item_text = f"⏳ {name}  •  {rating:.0f}  ({queue_type})"
-            item = QListWidgetItem(item_text)
-            self.list.addItem(item)
-    
-    def refresh(self, api):
-        """Fetch waiting players from API."""
-        try:
-            import httpx
-            r = httpx.get(f"{api.base_url}/matchmaking/waiting", timeout=5)
-            if r.status_code == 200:
-                self.set_players(r.json())
-        except:
-            pass
+            texts.append(f"⏳ {name}  •  {rating:.0f}  ({queue_type})")
+        
+        _sync_list(self.list, texts)
 
 
 class Lobby(QWidget):
     """Enhanced lobby with queue, waiting players, chat, and leaderboard."""
     
     gameReady = Signal(int)  # Emits game_id when matched
+    lobbyDataLoaded = Signal(object, object)  # (waiting, leaderboard), None where a fetch failed
     
     def __init__(self, api, on_game_ready, parent=None):
         super().__init__(parent)
@@ -156,7 +147,10 @@ class Lobby(QWidget):
         self.open_game_cb = on_game_ready  # Backwards compatibility
         
         self._polling = False
-        self._poll_timer = None
+        self._search = 0  # bumped per search; an older search's thread then stops
+        self._match_ws = None  # matchmaking push socket while searching
+        self.lobbyDataLoaded.connect(self._on_lobby_data)
+        self.gameReady.connect(self._on_matched)
         
         self._setup_ui()
     
@@ -247,18 +241,41 @@ class Lobby(QWidget):
         self.leaderboard.setFixedWidth(280)
         root.addWidget(self.leaderboard)
         
+        # Next refresh is armed 10 s after the previous one lands, so a slow
+        # network never has requests piling up
+        self._refresh_timer = QTimer(self, singleShot=True)
+        self._refresh_timer.timeout.connect(self._refresh_lobby_data)
+        
         # Initial data load
         self._refresh_lobby_data()
-        
-        # Periodic refresh timer
-        self._refresh_timer = QTimer(self)
-        self._refresh_timer.timeout.connect(self._refresh_lobby_data)
-        self._refresh_timer.start(10000)  # Refresh every 10 seconds
     
     def _refresh_lobby_data(self):
-        """Refresh waiting players and leaderboard."""
-        self.waiting_players.refresh(self.api)
-        self.leaderboard.refresh(self.api)
+        """Refresh waiting players and leaderboard, fetched off the GUI thread."""
+        QThreadPool.globalInstance().start(Call(self._load_lobby_data))
+    
+    def _load_lobby_data(self):
+        """Worker thread: both GETs; hands the results to the GUI thread."""
+        try:
+            waiting = self.api.waiting_players()
+        except Exception:
+            waiting = None
+        try:
+            top = self.api.leaderboard()
+        except Exception:
+            top = None
+        self.lobbyDataLoaded.emit(waiting, top)
+    
+    def _on_lobby_data(self, waiting, top):
+        self._refresh_timer.start(10000)
+        if waiting is not None:
+            self.waiting_players.set_players(waiting)
+        self.leaderboard.set_players(top if top is not None else LeaderboardWidget.SAMPLE_PLAYERS)
+    
+    def _set_info_state(self, state: str):
+        # Colours come from QLabel#Subtitle[state=...] in the app QSS
+        self.info.setProperty("state", state)
+        self.info.style().unpolish(self.info)
+        self.info.style().polish(self.info)
     
     def queue_pvp(self):
         """Queue for PvP matchmaking."""
@@ -267,7 +284,7 @@ class Lobby(QWidget):
             
             if q.get("status") == "waiting":
                 self.info.setText("🔍 Searching for opponent...")
-                self.info.setStyleSheet("color: #d4af37; font-weight: 600;")
+                self._set_info_state("searching")
                 self.btn_pvp.setEnabled(False)
                 self.btn_sys.setEnabled(False)
                 self.btn_cancel.show()
@@ -297,43 +314,60 @@ class Lobby(QWidget):
         """Cancel matchmaking."""
         self._polling = False
         self.info.setText("Search cancelled")
-        self.info.setStyleSheet("")
+        self._set_info_state("")
         self.btn_pvp.setEnabled(True)
         self.btn_sys.setEnabled(True)
         self.btn_cancel.hide()
         
-        # Call cancel endpoint if available
+        ws = self._match_ws
+        if ws is not None:
+            ws.close()  # ends the waiting thread's recv()
+        
         try:
-            import httpx
-            httpx.post(f"{self.api.base_url}/matchmaking/cancel", 
-                      json={"player_id": self.api.player_id}, timeout=5)
+            self.api.cancel_queue()
         except:
             pass
     
     def _start_polling(self, queue_id=None):
-        """Poll for match updates."""
+        """Wait for the server to push our match over /matchmaking/ws."""
         self._polling = True
+        self._search += 1
+        search = self._search
+        url = f"{ws_base(self.api.base_url)}/matchmaking/ws"
+        headers = {"Authorization": f"Bearer {self.api.token}"}
         
-        def poll():
-            while self._polling:
+        def searching() -> bool:
+            # False once cancelled, or once a newer search (cancel + play again) took over
+            return self._polling and self._search == search
+        
+        def wait():
+            from websockets.sync.client import connect
+            
+            while searching():
+                ws = None
                 try:
-                    q = self.api.queue(ranked=self.ranked.isChecked(), vs_system=False)
-                    if q.get("game_id"):
+                    with connect(url, additional_headers=headers, compression=None) as ws:
+                        self._match_ws = ws
+                        data = orjson.loads(ws.recv())
+                    if data.get("type") == "matched" and searching():
                         self._polling = False
                         # Use signal to call on_game_ready in main thread
-                        self.gameReady.emit(q["game_id"])
+                        self.gameReady.emit(data["game_id"])
                         return
-                except:
-                    pass
-                time.sleep(1)
-        
-        self.gameReady.connect(self._on_matched)
-        threading.Thread(target=poll, daemon=True).start()
+                except Exception:
+                    # Dropped connection: the match (if any) is kept server-side
+                    if searching():
+                        time.sleep(1)
+                finally:
+                    if self._match_ws is ws:
+                        self._match_ws = None
+        
+        threading.Thread(target=wait, daemon=True).start()
     
     def _on_matched(self, game_id: int):
         """Called when matched (in main thread)."""
         self.info.setText("Match found!")
-        self.info.setStyleSheet("color: #40916c; font-weight: 600;")
+        self._set_info_state("matched")
         self.btn_pvp.setEnabled(True)
         self.btn_sys.setEnabled(True)
         self.btn_cancel.hide()
@@ -342,12 +376,9 @@ class Lobby(QWidget):
     def send_lobby_chat(self, text: str):
         """Send message to lobby chat."""
         try:
-            # Call lobby chat endpoint if available
-            import httpx
-            httpx.post(f"{self.api.base_url}/lobby/chat",
-                      json={"player_id": self.api.player_id, "text": text}, timeout=5)
-            # Add locally for now
-            me = self.api.me()
-            self.chat.append_player(me.get("name", "You"), text)
+            # Through the shared client, so the token is sent
+            self.api.lobby_chat(text)
+            # Add locally for now; the name is known since login
+            self.chat.append_player(self.api.name or "You", text)
         except Exception as e:
             self.chat.append_system(f"Chat error: {e}")
@@ -1,15 +1,19 @@
 # start_menu.py - Enhanced Start Menu
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QPushButton, QLabel, QMessageBox, 
-    QFrame, QHBoxLayout
+    QWidget, QPushButton, QLabel, QMessageBox, QFrame
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 
+from .layouts import vbox, hbox
 from .login_dialog import LoginDialog
 from .create_account_dialog import CreateAccountDialog
-from .lobby import Lobby
-from .game_window import GameWindow
+
+
+def _pin_height(label: QLabel):
+    """Fix a one-line label's height so relayouts don't re-measure its text."""
+    label.ensurePolished()  # font from the app QSS, not the default one
+    label.setFixedHeight(label.fontMetrics().height() + 4)
 
 
 class StartMenu(QWidget):
@@ -23,37 +27,32 @@ class StartMenu(QWidget):
         
         self.lobby = None
         self.game = None
+        self._account_key: tuple | None = None  # me() fields the header shows
         
         self._setup_ui()
         
-        # If already logged in, show lobby
+        # If already logged in, show lobby once the window has painted;
+        # building it here would hold the first frame behind /players/me
+        # and the lobby/game imports
         if self.api.token:
-            self.show_lobby()
+            QTimer.singleShot(0, self.show_lobby)
     
     def _setup_ui(self):
-        root = QVBoxLayout(self)
-        root.setContentsMargins(20, 20, 20, 20)
-        root.setSpacing(16)
+        self._root = root = vbox(self, (20, 20, 20, 20), 16)
         
         # ==========================================
         # HEADER
         # ==========================================
         header = QFrame()
         header.setObjectName("Card")
-        header_layout = QHBoxLayout(header)
-        header_layout.setContentsMargins(20, 16, 20, 16)
+        header_layout = hbox(header, (20, 16, 20, 16), None)
         
         # Logo / Title
-        title_section = QVBoxLayout()
+        title_section = vbox(margins=None, spacing=None)
         
         title = QLabel("♟ Chess Arena")
-        title.setObjectName("Title")
-        title.setStyleSheet("""
-            font-size: 32px;
-            font-weight: 800;
-            color: #ffffff;
-            letter-spacing: 2px;
-        """)
+        title.setObjectName("AppTitle")
+        _pin_height(title)
         title_section.addWidget(title)
         
         subtitle = QLabel("Online Multiplayer Chess")
@@ -64,35 +63,44 @@ class StartMenu(QWidget):
         header_layout.addStretch()
         
         # Account status
-        self.account_section = QVBoxLayout()
+        self.account_section = vbox(margins=None, spacing=None)
         self.account_section.setAlignment(Qt.AlignRight)
         
         self.account_name = QLabel("Not logged in")
         self.account_name.setObjectName("PlayerName")
+        # Player-chosen name: skip rich-text sniffing, never render markup
+        self.account_name.setTextFormat(Qt.PlainText)
         self.account_name.setAlignment(Qt.AlignRight)
+        _pin_height(self.account_name)
         self.account_section.addWidget(self.account_name)
         
         self.account_stats = QLabel("")
         self.account_stats.setObjectName("Subtitle")
         self.account_stats.setAlignment(Qt.AlignRight)
+        _pin_height(self.account_stats)
         self.account_section.addWidget(self.account_stats)
         
         header_layout.addLayout(self.account_section)
         
         root.addWidget(header)
         
+        # Only one card is ever on screen; the other is built when needed
+        self.auth_card = None
+        self.lobby_card = None
+        if not self.api.token:
+            self._build_auth_card()
+    
+    def _build_auth_card(self):
         # ==========================================
         # AUTH CARD (shown when not logged in)
         # ==========================================
         self.auth_card = QFrame()
         self.auth_card.setObjectName("Card")
-        auth_layout = QVBoxLayout(self.auth_card)
-        auth_layout.setContentsMargins(40, 40, 40, 40)
-        auth_layout.setSpacing(20)
+        auth_layout = vbox(self.auth_card, (40, 40, 40, 40), 20)
         
         # Welcome message
         welcome = QLabel("Welcome to Chess Arena")
-        welcome.setStyleSheet("font-size: 24px; font-weight: 700; color: #ffffff;")
+        welcome.setObjectName("WelcomeTitle")
         welcome.setAlignment(Qt.AlignCenter)
         auth_layout.addWidget(welcome)
         
@@ -104,7 +112,7 @@ class StartMenu(QWidget):
         auth_layout.addSpacing(20)
         
         # Auth buttons
-        btn_container = QHBoxLayout()
+        btn_container = hbox(margins=None, spacing=None)
         btn_container.addStretch()
         
         self.btn_login = QPushButton("Login")
@@ -123,19 +131,17 @@ class StartMenu(QWidget):
         btn_container.addStretch()
         auth_layout.addLayout(btn_container)
         
-        root.addWidget(self.auth_card, stretch=1)
-        
+        self._root.addWidget(self.auth_card, stretch=1)
+    
+    def _build_lobby_card(self):
         # ==========================================
         # LOBBY CONTAINER (shown when logged in)
         # ==========================================
         self.lobby_card = QFrame()
         self.lobby_card.setObjectName("Card")
-        self.lobby_layout = QVBoxLayout(self.lobby_card)
-        self.lobby_layout.setContentsMargins(16, 16, 16, 16)
-        self.lobby_layout.setSpacing(0)
-        self.lobby_card.hide()
+        self.lobby_layout = vbox(self.lobby_card, (16, 16, 16, 16), 0)
         
-        root.addWidget(self.lobby_card, stretch=1)
+        self._root.addWidget(self.lobby_card, stretch=1)
     
     def login(self):
         dlg = LoginDialog(self.api, self)
@@ -151,30 +157,60 @@ class StartMenu(QWidget):
         try:
             me = self.api.me()
         except Exception as e:
+            # e.g. a cached token the server rejected: fall back to logging in
+            if self.auth_card is None and self.lobby_card is None:
+                self._build_auth_card()
             QMessageBox.critical(self, "Error", str(e))
             return
         
-        # Update header
-        self.account_name.setText(me.get("name", "Player"))
+        # Imported on first use: the lobby and game window pull in python-chess,
+        # which the login screen doesn't need
+        from .lobby import Lobby
+        
+        # One layout/paint pass for the whole swap
+        self.setUpdatesEnabled(False)
+        try:
+            self._update_account(me)
+            
+            # Swap the auth card for the lobby card
+            if self.auth_card is not None:
+                self.auth_card.hide()
+                self.auth_card.deleteLater()
+                self.auth_card = None
+            if self.lobby_card is None:
+                self._build_lobby_card()
+            
+            # Replace lobby widget; the old one is out of the layout before the new one goes in
+            if self.lobby:
+                self.lobby_layout.removeWidget(self.lobby)
+                self.lobby.setParent(None)
+                self.lobby.deleteLater()
+                self.lobby = None
+            
+            # Parented to its card from the start, so it's polished once, in place
+            self.lobby = Lobby(self.api, self.open_game, self.lobby_card)
+            self.lobby_layout.addWidget(self.lobby)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+    
+    def _update_account(self, me: dict):
+        """Header name/stats; labels are only touched when a shown field changed."""
+        key = (me.get("name", "Player"), me.get("rating", 1500),
+               me.get("wins", 0), me.get("losses", 0), me.get("draws", 0))
+        if key == self._account_key:
+            return
+        name, rating, wins, losses, draws = key
+        if self._account_key is None or name != self._account_key[0]:
+            self.account_name.setText(name)
         self.account_stats.setText(
-            f"Rating: {me.get('rating', 1500):.0f}  •  "
-            f"W: {me.get('wins', 0)}  L: {me.get('losses', 0)}  D: {me.get('draws', 0)}"
+            f"Rating: {rating:.0f}  •  W: {wins}  L: {losses}  D: {draws}"
         )
-        
-        # Hide auth, show lobby
-        self.auth_card.hide()
-        self.lobby_card.show()
-        
-        # Replace lobby widget
-        if self.lobby:
-            self.lobby.setParent(None)
-            self.lobby.deleteLater()
-            self.lobby = None
-        
-        self.lobby = Lobby(self.api, self.open_game, self)
-        self.lobby_layout.addWidget(self.lobby)
+        self._account_key = key
     
     def open_game(self, game_id: int):
+        from .game_window import GameWindow
+
         self.game = GameWindow(self.api, game_id, None)
         self.game.resize(1200, 850)
         self.game.show()
@@ -1,5 +1,7 @@
 # theme.py - Premium Dark Chess Theme
 
+import re
+
 APP_QSS = """
 /* ============================================
    CHESS ARENA - PREMIUM DARK THEME
@@ -28,6 +30,29 @@ QLabel#Subtitle {
     color: #6b7d99;
 }
 
+QLabel#Subtitle[state="searching"] {
+    color: #d4af37;
+    font-weight: 600;
+}
+
+QLabel#Subtitle[state="matched"] {
+    color: #40916c;
+    font-weight: 600;
+}
+
+QLabel#AppTitle {
+    font-size: 32px;
+    font-weight: 800;
+    color: #ffffff;
+    letter-spacing: 2px;
+}
+
+QLabel#WelcomeTitle {
+    font-size: 24px;
+    font-weight: 700;
+    color: #ffffff;
+}
+
 QLabel#SectionHeader {
     font-size: 14px;
     font-weight: 600;
@@ -181,7 +206,7 @@ QLineEdit:disabled {
     color: #4a5a6a;
 }
 
-QTextEdit {
+QTextEdit, QPlainTextEdit {
     background: #0a0e14;
     border: 1px solid #1f2a3a;
     border-radius: 8px;
@@ -190,7 +215,7 @@ QTextEdit {
     font-size: 12px;
 }
 
-QTextEdit:focus {
+QTextEdit:focus, QPlainTextEdit:focus {
     border: 1px solid #40916c;
 }
 
@@ -305,37 +330,6 @@ QLabel#BlackMove {
     font-family: "Consolas", "SF Mono", monospace;
 }
 
-QLabel#ChatMessage {
-    font-size: 12px;
-    padding: 4px 0;
-}
-
-QLabel#SystemMessage {
-    font-size: 11px;
-    color: #6b7d99;
-    font-style: italic;
-}
-
-QLabel#OnlineIndicator {
-    color: #40916c;
-    font-size: 11px;
-}
-
-QLabel#RankGold {
-    color: #d4af37;
-    font-weight: 700;
-}
-
-QLabel#RankSilver {
-    color: #a8a8a8;
-    font-weight: 600;
-}
-
-QLabel#RankBronze {
-    color: #cd7f32;
-    font-weight: 600;
-}
-
 /* ============================================
    CHESS BOARD SPECIFIC
    ============================================ */
@@ -343,11 +337,6 @@ QLabel#RankBronze {
     background: transparent;
 }
 
-QLabel#CapturedPiece {
-    font-size: 20px;
-    padding: 0 2px;
-}
-
 QLabel#TurnIndicator {
     font-size: 13px;
     font-weight: 600;
@@ -355,16 +344,31 @@ QLabel#TurnIndicator {
     border-radius: 6px;
 }
 
-QLabel#YourTurn {
+/* Game window turn label; switched with setProperty("turn", ...) */
+QLabel#TurnIndicator[turn="mine"],
+QLabel#TurnIndicator[turn="theirs"],
+QLabel#TurnIndicator[turn="over"] {
+    font-size: 14px;
+    padding: 8px 16px;
+    border-radius: 6px;
+}
+
+QLabel#TurnIndicator[turn="mine"] {
+    font-weight: 700;
     background: #2d6a4f;
     color: #ffffff;
 }
 
-QLabel#OpponentTurn {
+QLabel#TurnIndicator[turn="theirs"] {
     background: #1f2a3a;
     color: #8fa4bf;
 }
 
+QLabel#TurnIndicator[turn="over"] {
+    background: #742a2a;
+    color: #ffffff;
+}
+
 /* ============================================
    TOOLTIPS
    ============================================ */
@@ -378,6 +382,25 @@ QToolTip {
 }
 """
 
+
+def _minify_qss(qss: str) -> str:
+    """Strip comments and collapse whitespace; Qt's CSS parser scans every character."""
+    qss = re.sub(r"/\*.*?\*/", "", qss, flags=re.S)
+    return re.sub(r"\s+", " ", qss).strip()
+
+
+# Kept readable above, handed to Qt minified
+APP_QSS = _minify_qss(APP_QSS)
+
+
+def install_theme(app):
+    """Style the whole app from one sheet, set once on the QApplication.
+
+    Qt parses it once; widgets pick rules by objectName and dynamic
+    properties instead of carrying their own stylesheets.
+    """
+    app.setStyleSheet(APP_QSS)
+
 # Chess piece unicode characters
 PIECE_SYMBOLS = {
     'K': '♔', 'Q': '♕', 'R': '♖', 'B': '♗', 'N': '♘', 'P': '♙',
@@ -1,11 +1,43 @@
 # chat_widget.py - Enhanced Chat Widget
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QLineEdit, 
+    QWidget, QPlainTextEdit, QLineEdit, 
     QPushButton, QLabel, QScrollArea, QFrame
 )
-from PySide6.QtCore import Qt, Signal
-from datetime import datetime
+from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtGui import QColor, QFont, QTextBlockFormat, QTextCharFormat, QTextCursor
+import time
+
+from ..layouts import vbox, hbox
+
+
+# Oldest lines are dropped past this many, so inserts stay cheap in long sessions
+MAX_LINES = 500
+
+# Lines arriving within this many ms are inserted (and painted) together
+FLUSH_MS = 50
+
+# Format name -> (colour, bold, italic); "" is the widget's plain text style
+_STYLES = {
+    "stamp": ("#6b7d99", False, False),
+    "self": ("#40916c", True, False),
+    "opp": ("#c53030", True, False),
+    "system": ("#8fa4bf", False, True),
+}
+
+_stamp_minute = -1
+_stamp = ("", "stamp")
+
+
+def _timestamp() -> tuple[str, str]:
+    """The '[HH:MM] ' run that starts a line; rebuilt only when the minute changes."""
+    global _stamp_minute, _stamp
+    now = time.time()
+    minute = int(now // 60)
+    if minute != _stamp_minute:
+        _stamp_minute = minute
+        _stamp = (time.strftime("[%H:%M] ", time.localtime(now)), "stamp")
+    return _stamp
 
 
 class ChatWidget(QWidget):
@@ -17,9 +49,7 @@ class ChatWidget(QWidget):
         super().__init__(parent)
         self.setObjectName("ChatPanel")
         
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(12, 12, 12, 12)
-        layout.setSpacing(8)
+        layout = vbox(self, (12, 12, 12, 12), 8)
         
         # Header
         header = QLabel(title)
@@ -27,22 +57,32 @@ class ChatWidget(QWidget):
         layout.addWidget(header)
         
         # Messages area
-        self.messages = QTextEdit()
+        # Plain text with char formats: no HTML parsing per line, and chat
+        # text from other players is never interpreted as markup
+        self.messages = QPlainTextEdit()
         self.messages.setReadOnly(True)
-        self.messages.setStyleSheet("""
-            QTextEdit {
-                background: #0a0e14;
-                border: 1px solid #1f2a3a;
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 12px;
-            }
-        """)
+        self.messages.setUndoRedoEnabled(False)
+        self.messages.setMaximumBlockCount(MAX_LINES)
+        # Private cursor that only appends; the view's own cursor/selection is left alone
+        self._cursor = QTextCursor(self.messages.document())
+        self._formats = {"": QTextCharFormat()}
+        for name, (color, bold, italic) in _STYLES.items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            if bold:
+                fmt.setFontWeight(QFont.DemiBold)
+            fmt.setFontItalic(italic)
+            self._formats[name] = fmt
+        # Each line is a tuple of (text, format name) runs
+        self._pending: list[tuple[tuple[str, str], ...]] = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_MS)
+        self._flush_timer.timeout.connect(self._flush_pending)
         layout.addWidget(self.messages, stretch=1)
         
         # Input area
-        input_row = QHBoxLayout()
-        input_row.setSpacing(8)
+        input_row = hbox(margins=None, spacing=8)
         
         self.input = QLineEdit()
         self.input.setPlaceholderText("Type a message...")
@@ -62,32 +102,62 @@ class ChatWidget(QWidget):
             self.sendChat.emit(text)
             self.input.clear()
     
+    def _insert(self, lines: list[tuple[tuple[str, str], ...]]):
+        """Queue lines; a burst is written out together after FLUSH_MS."""
+        self._pending.extend(lines)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def _flush_pending(self):
+        """Append each pending line as its own block; follow them only if already at the bottom."""
+        lines, self._pending = self._pending, []
+        if not lines:
+            return
+        bar = self.messages.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 4
+        
+        cursor = self._cursor
+        cursor.movePosition(QTextCursor.End)
+        # One edit block: the document is laid out once for the whole batch
+        cursor.beginEditBlock()
+        formats = self._formats
+        for runs in lines:
+            if not self.messages.document().isEmpty():
+                cursor.insertBlock(QTextBlockFormat(), formats[""])
+            for text, fmt in runs:
+                cursor.insertText(text, formats[fmt])
+        cursor.endEditBlock()
+        
+        # Qt only auto-follows through the view's own cursor (appendPlainText,
+        # ensureCursorVisible); this private cursor doesn't move the view, so
+        # one explicit scroll per batch is the follow
+        if at_bottom:
+            bar.setValue(bar.maximum())
+    
     def append(self, message: str):
         """Add a message to the chat."""
-        timestamp = datetime.now().strftime("%H:%M")
-        self.messages.append(f'<span style="color: #6b7d99;">[{timestamp}]</span> {message}')
-        
-        # Scroll to bottom
-        scrollbar = self.messages.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        self._insert([(_timestamp(), (message, ""))])
+    
+    def append_many(self, messages: list[str]):
+        """Add several messages sharing one timestamp."""
+        if not messages:
+            return
+        stamp = _timestamp()
+        self._insert([(stamp, (m, "")) for m in messages])
     
     def append_system(self, message: str):
         """Add a system message."""
-        self.messages.append(f'<span style="color: #8fa4bf; font-style: italic;">{message}</span>')
-        scrollbar = self.messages.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        self._insert([((message, "system"),)])
     
     def append_player(self, player_name: str, message: str, is_opponent: bool = False):
         """Add a player message with formatting."""
-        timestamp = datetime.now().strftime("%H:%M")
-        color = "#c53030" if is_opponent else "#40916c"
-        self.messages.append(
-            f'<span style="color: #6b7d99;">[{timestamp}]</span> '
-            f'<span style="color: {color}; font-weight: 600;">{player_name}:</span> {message}'
-        )
-        scrollbar = self.messages.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        self._insert([(
+            _timestamp(),
+            (player_name + ": ", "opp" if is_opponent else "self"),
+            (message, ""),
+        )])
     
     def clear_messages(self):
         """Clear all messages."""
+        self._pending.clear()
         self.messages.clear()
@@ -1,5 +1,7 @@
 # chess_board_widget.py - Enhanced Chess Board with Captured Pieces
 
+from functools import lru_cache
+
 import chess
 from PySide6.QtWidgets import (
     QWidget, QGridLayout, QLabel, QVBoxLayout, QHBoxLayout, QFrame, QSizePolicy
@@ -9,6 +11,41 @@ from PySide6.QtGui import QFont, QColor, QPainter, QBrush, QPen
 
 from ..theme import BOARD_COLORS, PIECE_SYMBOLS
 
+# Piece letter -> unicode glyph, applied in C by str.translate
+_PIECE_TRANS = str.maketrans(PIECE_SYMBOLS)
+
+
+def _board_placement(board: chess.Board) -> tuple[tuple[tuple[int, str], ...], int | None]:
+    """Board -> (occupied (square index, symbol) pairs, checked king's square)."""
+    placement = tuple((sq, piece.symbol()) for sq, piece in board.piece_map().items())
+    check_square = board.king(board.turn) if board.is_check() else None
+    return placement, check_square
+
+
+@lru_cache(maxsize=128)
+def _parse_fen(fen: str) -> tuple[tuple[tuple[int, str], ...], int | None]:
+    board = chess.Board() if not fen or fen == "startpos" else chess.Board(fen)
+    return _board_placement(board)
+
+
+@lru_cache(maxsize=64)
+def _square_css(base_color: str, piece_color: str, ring: bool) -> str:
+    """Stylesheets are shared between squares; Qt parses each distinct one once."""
+    style = f"""
+            background-color: {base_color};
+            color: {piece_color};
+            font-size: 42px;
+            font-weight: bold;
+            border: none;
+        """
+    if ring:
+        style += f"border: 3px solid {BOARD_COLORS['legal']};"
+    return style
+
+
+# Rank/file coordinate labels
+_COORD_CSS = "color: #8fa4bf; font-size: 11px; font-weight: 600; background: transparent;"
+
 
 class SquareWidget(QLabel):
     """Individual chess square that can be clicked."""
@@ -24,6 +61,7 @@ class SquareWidget(QLabel):
         self.is_legal_target = False
         self.is_last_move = False
         self.is_check = False
+        self._style = None
         
         self.setAlignment(Qt.AlignCenter)
         self.setMinimumSize(60, 60)
@@ -44,33 +82,18 @@ class SquareWidget(QLabel):
         
         # Piece color - white pieces are lighter, black pieces are darker
         piece_color = "#1a1a1a" if self.piece and self.piece.islower() else "#ffffff"
-        text_shadow = "1px 1px 2px rgba(0,0,0,0.5)" if self.piece and self.piece.isupper() else "none"
-        
-        style = f"""
-            background-color: {base_color};
-            color: {piece_color};
-            font-size: 42px;
-            font-weight: bold;
-            border: none;
-        """
         
-        if self.is_legal_target:
-            # Add dot indicator for legal moves
-            if self.piece:
-                # Capture indicator - ring around piece
-                style += f"border: 3px solid {BOARD_COLORS['legal']};"
-            else:
-                # Empty square - will draw dot in paintEvent
-                pass
+        # Capture indicator - ring around piece (empty targets get a dot in paintEvent)
+        ring = bool(self.is_legal_target and self.piece)
         
-        self.setStyleSheet(style)
+        style = _square_css(base_color, piece_color, ring)
+        if style != self._style:
+            self._style = style
+            self.setStyleSheet(style)
     
     def set_piece(self, piece: str | None):
         self.piece = piece
-        if piece:
-            self.setText(PIECE_SYMBOLS.get(piece, piece))
-        else:
-            self.setText("")
+        self.setText(piece.translate(_PIECE_TRANS) if piece else "")
         self._update_style()
     
     def set_highlighted(self, highlighted: bool):
@@ -151,7 +174,7 @@ class CapturedPiecesWidget(QWidget):
         sorted_pieces = sorted(pieces, key=lambda p: order.get(p, 5))
         
         # Convert to symbols
-        symbols = ''.join(PIECE_SYMBOLS.get(p, p) for p in sorted_pieces)
+        symbols = ''.join(sorted_pieces).translate(_PIECE_TRANS)
         self.pieces_label.setText(symbols)
         
         # Show advantage
@@ -175,6 +198,10 @@ class ChessBoardWidget(QWidget):
         self.setObjectName("ChessBoardWidget")
         
         self.squares: dict[str, SquareWidget] = {}
+        self._by_index: list[SquareWidget | None] = [None] * 64  # chess.Square -> widget
+        self._last: list[str | None] = [None] * 64  # piece symbol last rendered per square
+        self._last_check: int | None = None
+        self._marked: list[SquareWidget] = []  # squares with a selection/target highlight
         self.flipped = False
         self.last_move_from = None
         self.last_move_to = None
@@ -203,8 +230,11 @@ class ChessBoardWidget(QWidget):
         inner_layout.setContentsMargins(0, 0, 0, 0)
         inner_layout.setSpacing(0)
         
-        # Create board squares
+        # Create board squares; one layout pass once all 64 are in
+        self.setUpdatesEnabled(False)
         self._create_board(inner_layout)
+        self.setUpdatesEnabled(True)
+        inner_layout.activate()
         
         board_layout.addWidget(inner_frame)
         main_layout.addWidget(board_container, stretch=1)
@@ -223,7 +253,7 @@ class ChessBoardWidget(QWidget):
             rank_label = QLabel(rank)
             rank_label.setAlignment(Qt.AlignCenter)
             rank_label.setFixedWidth(20)
-            rank_label.setStyleSheet("color: #8fa4bf; font-size: 11px; font-weight: 600; background: transparent;")
+            rank_label.setStyleSheet(_COORD_CSS)
             layout.addWidget(rank_label, row, 0)
             
             for col, file in enumerate(files):
@@ -234,13 +264,14 @@ class ChessBoardWidget(QWidget):
                 square.clicked.connect(self.squareClicked.emit)
                 
                 self.squares[square_name] = square
+                self._by_index[chess.square(col, 7 - row)] = square
                 layout.addWidget(square, row, col + 1)
             
             # Rank label on right
             rank_label2 = QLabel(rank)
             rank_label2.setAlignment(Qt.AlignCenter)
             rank_label2.setFixedWidth(20)
-            rank_label2.setStyleSheet("color: #8fa4bf; font-size: 11px; font-weight: 600; background: transparent;")
+            rank_label2.setStyleSheet(_COORD_CSS)
             layout.addWidget(rank_label2, row, 9)
         
         # File labels at bottom
@@ -248,43 +279,51 @@ class ChessBoardWidget(QWidget):
             file_label = QLabel(file)
             file_label.setAlignment(Qt.AlignCenter)
             file_label.setFixedHeight(20)
-            file_label.setStyleSheet("color: #8fa4bf; font-size: 11px; font-weight: 600; background: transparent;")
+            file_label.setStyleSheet(_COORD_CSS)
             layout.addWidget(file_label, 8, col + 1)
     
     def set_fen(self, fen: str):
         """Update board position from FEN string."""
-        if not fen or fen == "startpos":
-            board = chess.Board()
-        else:
-            board = chess.Board(fen)
-        
-        # Clear all squares first
-        for sq in self.squares.values():
-            sq.set_piece(None)
-            sq.set_check(False)
-        
-        # Place pieces
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            square_name = chess.square_name(square)
-            if square_name in self.squares:
-                if piece:
-                    self.squares[square_name].set_piece(piece.symbol())
-                else:
-                    self.squares[square_name].set_piece(None)
-        
-        # Highlight king if in check
-        if board.is_check():
-            king_square = board.king(board.turn)
-            if king_square is not None:
-                king_name = chess.square_name(king_square)
-                if king_name in self.squares:
-                    self.squares[king_name].set_check(True)
+        self._render(*_parse_fen(fen))
+    
+    def set_board(self, board: chess.Board):
+        """Update board position from a live board (no FEN parsing)."""
+        self._render(*_board_placement(board))
+    
+    def _render(self, placement: tuple[tuple[int, str], ...], check_square: int | None):
+        new = [None] * 64
+        for sq, symbol in placement:
+            new[sq] = symbol
+        
+        last = self._last
+        if new == last and check_square == self._last_check:
+            return
+        
+        # Only touch squares that changed (a move is usually 2-4 squares),
+        # and repaint once at the end
+        by_index = self._by_index
+        self.setUpdatesEnabled(False)
+        try:
+            for sq in range(64):
+                if new[sq] != last[sq]:
+                    by_index[sq].set_piece(new[sq])
+            
+            # Move the check highlight
+            if check_square != self._last_check:
+                if self._last_check is not None:
+                    by_index[self._last_check].set_check(False)
+                if check_square is not None:
+                    by_index[check_square].set_check(True)
+        finally:
+            self.setUpdatesEnabled(True)
+        
+        self._last = new
+        self._last_check = check_square
         
         # Update captured pieces
-        self._update_captured(board)
+        self._update_captured(placement)
     
-    def _update_captured(self, board: chess.Board):
+    def _update_captured(self, placement: tuple[tuple[int, str], ...]):
         """Calculate and display captured pieces."""
         # Starting piece counts
         start_counts = {'P': 8, 'N': 2, 'B': 2, 'R': 2, 'Q': 1, 'K': 1,
@@ -292,11 +331,8 @@ class ChessBoardWidget(QWidget):
         
         # Current piece counts
         current_counts = {}
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                sym = piece.symbol()
-                current_counts[sym] = current_counts.get(sym, 0) + 1
+        for _, sym in placement:
+            current_counts[sym] = current_counts.get(sym, 0) + 1
         
         # Calculate captured
         white_captured = []  # Black pieces that White captured
@@ -327,22 +363,27 @@ class ChessBoardWidget(QWidget):
         self.captured_black.set_captured(white_captured, advantage if advantage > 0 else 0)
         self.captured_white.set_captured(black_captured, -advantage if advantage < 0 else 0)
     
-    def highlight_squares(self, selected: str, legal_targets: list[str]):
-        """Highlight selected square and legal move targets."""
+    def highlight_squares(self, selected: str, legal_targets):
+        """Highlight selected square and legal move targets (any iterable, order doesn't matter)."""
         self.clear_highlights()
         
         if selected in self.squares:
-            self.squares[selected].set_highlighted(True)
+            sq = self.squares[selected]
+            sq.set_highlighted(True)
+            self._marked.append(sq)
         
         for target in legal_targets:
             if target in self.squares:
-                self.squares[target].set_legal_target(True)
+                sq = self.squares[target]
+                sq.set_legal_target(True)
+                self._marked.append(sq)
     
     def clear_highlights(self):
-        """Clear all highlights."""
-        for sq in self.squares.values():
+        """Clear all highlights; only the squares that have one are touched."""
+        for sq in self._marked:
             sq.set_highlighted(False)
             sq.set_legal_target(False)
+        self._marked.clear()
     
     def set_last_move(self, from_sq: str | None, to_sq: str | None):
         """Highlight the last move played."""
@@ -12,6 +12,7 @@ class MoveHistoryWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.moves = []
+        self._last_pgn: str | None = None
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
@@ -23,7 +24,7 @@ class MoveHistoryWidget(QWidget):
         layout.addWidget(header)
         
         # Scroll area for moves
-        scroll = QScrollArea()
+        self.scroll = scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         scroll.setStyleSheet("QScrollArea { border: none; background: transparent; }")
@@ -36,9 +37,21 @@ class MoveHistoryWidget(QWidget):
         
         scroll.setWidget(self.moves_container)
         layout.addWidget(scroll, stretch=1)
+        
+        # Follow new moves while scrolled to the bottom. The range only grows
+        # once the layout has run, so scroll when it changes rather than
+        # right after adding a row; scrolling up to review moves stops following
+        self._follow = True
+        bar = scroll.verticalScrollBar()
+        bar.valueChanged.connect(self._on_scrolled)
+        bar.rangeChanged.connect(self._on_range_changed)
     
     def set_pgn(self, pgn: str):
         """Parse and display moves from PGN move text."""
+        if pgn == self._last_pgn:
+            return
+        self._last_pgn = pgn
+        
         # Clear existing moves
         while self.moves_layout.count() > 1:
             item = self.moves_layout.takeAt(0)
@@ -76,11 +89,13 @@ class MoveHistoryWidget(QWidget):
         # Handle odd number of moves (white's last move without black response)
         if white_move is not None:
             self._add_move_row(current_move_num, white_move, "")
-        
-        # Scroll to bottom
-        self.moves_layout.parentWidget().parentWidget().verticalScrollBar().setValue(
-            self.moves_layout.parentWidget().parentWidget().verticalScrollBar().maximum()
-        )
+    
+    def _on_scrolled(self, value: int):
+        self._follow = value >= self.scroll.verticalScrollBar().maximum()
+    
+    def _on_range_changed(self, _minimum: int, maximum: int):
+        if self._follow:
+            self.scroll.verticalScrollBar().setValue(maximum)
     
     def _add_move_row(self, move_num: int, white_move: str, black_move: str):
         """Add a single move pair row."""
@@ -124,6 +139,7 @@ class MoveHistoryWidget(QWidget):
     
     def add_move(self, move_num: int, san: str, is_white: bool):
         """Add a single move (for real-time updates)."""
+        self._last_pgn = None
         if is_white:
             self._add_move_row(move_num, san, "")
         else:
@@ -137,6 +153,7 @@ class MoveHistoryWidget(QWidget):
     
     def clear(self):
         """Clear all moves."""
+        self._last_pgn = None
         while self.moves_layout.count() > 1:
             item = self.moves_layout.takeAt(0)
             if item.widget():
@@ -0,0 +1,14 @@
+# workers.py - Background work on Qt's thread pool
+
+from PySide6.QtCore import QRunnable
+
+
+class Call(QRunnable):
+    """Run a blocking call on Qt's global thread pool."""
+    
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+    
+    def run(self):
+        self.fn()
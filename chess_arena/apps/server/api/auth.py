@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from fastapi import APIRouter, Depends, HTTPException, Header
 from pydantic import BaseModel, EmailStr
+from sqlalchemy import select, bindparam
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 from jose import jwt
@@ -10,7 +13,24 @@ from ..db.models import Player
 from ..settings import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
-pwd = CryptContext(schemes=["argon2"], deprecated="auto")
+# argon2id for new hashes; legacy bcrypt hashes still verify and are
+# upgraded on the next successful login.
+pwd = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
+
+# argon2-cffi releases the GIL; a small dedicated pool caps how many
+# hashes run at once, so logins can't starve the default threadpool.
+# The handlers stay sync (threadpool) because their DB work is blocking.
+_hash_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pwd-hash")
+
+
+def _in_hash_pool(fn, *args):
+    return _hash_pool.submit(fn, *args).result()
+
+
+# Built once so SQLAlchemy's compiled-statement cache is hit on every call
+STMT_BY_EMAIL = select(Player).where(Player.email == bindparam("email"))
+STMT_BY_NAME = select(Player).where(Player.name == bindparam("name"))
+STMT_BY_API_KEY = select(Player).where(Player.api_key == bindparam("api_key"))
 
 
 class RegisterReq(BaseModel):
@@ -41,13 +61,15 @@ def make_token(player: Player) -> str:
 
 @router.post("/register", response_model=TokenRes)
 def register(req: RegisterReq, db: Session = Depends(get_db)):
-    if db.query(Player).filter((Player.email == req.email.lower()) | (Player.name == req.name.strip())).first():
+    # Two equality lookups on unique indexes instead of an OR
+    if (db.scalar(STMT_BY_EMAIL, {"email": req.email.lower()})
+            or db.scalar(STMT_BY_NAME, {"name": req.name.strip()})):
         raise HTTPException(400, "Email or name already used.")
 
     p = Player(
         email=req.email.lower(),
         name=req.name.strip(),
-        password_hash=pwd.hash(req.password),
+        password_hash=_in_hash_pool(pwd.hash, req.password),
         is_bot=req.is_bot
     )
     if p.is_bot:
@@ -64,14 +86,20 @@ def register(req: RegisterReq, db: Session = Depends(get_db)):
 
 @router.post("/login", response_model=TokenRes)
 def login(req: LoginReq, db: Session = Depends(get_db)):
-    p = db.query(Player).filter(Player.email == req.email.lower()).first()
-    if not p or not pwd.verify(req.password, p.password_hash):
+    p = db.scalar(STMT_BY_EMAIL, {"email": req.email.lower()})
+    if not p:
+        raise HTTPException(401, "Invalid credentials.")
+    ok, new_hash = _in_hash_pool(pwd.verify_and_update, req.password, p.password_hash)
+    if not ok:
         raise HTTPException(401, "Invalid credentials.")
+    if new_hash:
+        p.password_hash = new_hash
+        db.commit()
     return TokenRes(token=make_token(p), player_id=p.id, name=p.name, is_bot=p.is_bot, api_key=None)
 
 @router.post("/bot/login", response_model=TokenRes)
 def bot_login(x_api_key: str = Header(...), db: Session = Depends(get_db)):
-    p = db.query(Player).filter(Player.api_key == x_api_key).first()
+    p = db.scalar(STMT_BY_API_KEY, {"api_key": x_api_key})
     if not p or not p.is_bot:
         raise HTTPException(401, "Invalid bot API key.")
     return TokenRes(token=make_token(p), player_id=p.id, name=p.name, is_bot=True, api_key=p.api_key)
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, Header
+import asyncio
+
+import chess
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, Header, Response
 from pydantic import BaseModel
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..db.session import get_db
-from ..db.models import Game, Player
+from ..db.models import Game, Move, Player
 from ..realtime.ws_hub import hub
 from ..services.rating_glicko2 import update_after_game
 from ..services.stockfish_service import stockfish
-from ..api.players import get_player_from_auth
+from ..services.board_cache import boards
+from ..api.players import get_player_from_auth, public_player
 
-from chess_arena.packages.chesslib.rules import apply_uci_move, status_flags, board_from_fen_or_start
+from chess_arena.packages.chesslib.rules import push_uci, status_flags, board_from_fen_or_start
 
 
 
@@ -28,11 +34,10 @@ class ChatReq(BaseModel):
 
 # --------- Helpers ---------
 
-def end_game_if_needed(db: Session, g: Game) -> dict:
-    meta = status_flags(g.fen)
+def end_game_if_needed(db: Session, g: Game, b: chess.Board) -> dict:
+    meta = status_flags(b, boards.repetitions(g.id))
 
     if meta["is_checkmate"]:
-        b = board_from_fen_or_start(g.fen)
         g.status = "ended"
         # side to move is checkmated => other side won
         g.result = "0-1" if b.turn else "1-0"
@@ -48,9 +53,28 @@ def end_game_if_needed(db: Session, g: Game) -> dict:
         g.result = "1/2-1/2"
         g.end_reason = "insufficient_material"
 
+    if g.status == "ended":
+        boards.evict(g.id)
+        maybe_rate(db, g)
+
     return meta
 
 
+def push_and_record(db: Session, g: Game, b: chess.Board, uci: str) -> Move:
+    """Push a UCI move onto the game's board and append it to the move log."""
+    ply = (b.fullmove_number - 1) * 2 + (0 if b.turn else 1)
+    san = push_uci(b, uci)
+    rec = Move(game_id=g.id, ply=ply, san=san, uci=uci)
+    db.add(rec)
+    g.fen = boards.store(g.id, b)
+    return rec
+
+
+def game_pgn(db: Session, g: Game) -> str:
+    sans = db.scalars(select(Move.san).where(Move.game_id == g.id).order_by(Move.ply))
+    return g.pgn + "".join(san + " " for san in sans)
+
+
 def maybe_rate(db: Session, g: Game):
     if g.ranked and g.status == "ended" and g.white_id and g.black_id and g.result:
         w = db.get(Player, g.white_id)
@@ -59,88 +83,132 @@ def maybe_rate(db: Session, g: Game):
             update_after_game(w, b, g.result)
 
 
-def _random_legal_move_uci(fen: str) -> str:
+def _random_legal_move_uci(b: chess.Board) -> str:
     import random
-    b = board_from_fen_or_start(fen)
     moves = list(b.legal_moves)
     if not moves:
         return ""
     return random.choice(moves).uci()
 
 
+# One engine reply at a time per game; dropped once the game ends
+_system_locks: dict[int, asyncio.Lock] = {}
+
+
 async def maybe_play_system_move(db: Session, g: Game):
     """
-    If it's a bot's turn, play a move.
+    If it's a bot's turn, play its one reply, then commit and broadcast it.
     Stockfish is preferred; if unavailable, fallback to a random legal move.
-    This function may chain if the engine/bot gets multiple turns (rare).
+    Serialized per game, so two callers can't push the same ply twice.
     """
     if g.status != "active" or not g.white_id or not g.black_id:
         return
 
-    white = db.get(Player, g.white_id)
-    black = db.get(Player, g.black_id)
-    if not white or not black:
-        return
-
-    b = board_from_fen_or_start(g.fen)
-    bot_to_move = (b.turn and white.is_bot) or ((not b.turn) and black.is_bot)
-    if not bot_to_move:
-        return
-
-    # Try Stockfish; fallback to random move so vs_system never freezes
-    try:
-        uci = stockfish.best_move_uci(g.fen, think_ms=150)
-    except Exception:
-        uci = _random_legal_move_uci(g.fen)
+    async with _system_locks.setdefault(g.id, asyncio.Lock()):
+        # Another caller may have moved while we waited for the lock
+        db.refresh(g)
+        if g.status != "active":
+            return
+        b = boards.get(g.id, g.fen)
+        if not (g.white_is_bot if b.turn else g.black_is_bot):
+            return
 
-    if not uci:
-        return
+        # Try Stockfish; fallback to random move so vs_system never freezes
+        try:
+            uci = await stockfish.best_move_uci(g.fen, think_ms=150)
+        except Exception:
+            uci = _random_legal_move_uci(b)
 
-    try:
-        new_fen, san = apply_uci_move(g.fen, uci)
-    except ValueError:
-        # If engine gave an illegal move (rare), fallback random once
-        uci = _random_legal_move_uci(g.fen)
         if not uci:
             return
-        new_fen, san = apply_uci_move(g.fen, uci)
 
-    g.fen = new_fen
-    g.pgn += (san + " ")
-    meta = end_game_if_needed(db, g)
-    maybe_rate(db, g)
-    db.commit()
+        try:
+            rec = push_and_record(db, g, b, uci)
+        except ValueError:
+            # If engine gave an illegal move (rare), fallback random once
+            uci = _random_legal_move_uci(b)
+            if not uci:
+                return
+            rec = push_and_record(db, g, b, uci)
 
-    await hub.broadcast(
-        g.id,
-        {"type": "move", "game_id": g.id, "fen": g.fen, "pgn": g.pgn, "meta": meta, "uci": uci},
-    )
+        meta = end_game_if_needed(db, g, b)
+        db.commit()
 
-    # Chain (rare) — safe and non-recursive explosion due to board.turn flipping normally
-    if g.status == "active":
-        await maybe_play_system_move(db, g)
+        await hub.broadcast(g.id, {
+            "type": "move", "game_id": g.id, "fen": g.fen, "meta": meta,
+            "uci": uci, "san": rec.san, "ply": rec.ply, "status": g.status,
+            "result": g.result, "end_reason": g.end_reason,
+        })
 
+    if g.status == "ended":
+        _system_locks.pop(g.id, None)
 
-# --------- Routes ---------
 
-@router.get("/{game_id}")
-def get_game(game_id: int, db: Session = Depends(get_db)):
-    g = db.get(Game, game_id)
-    if not g:
-        raise HTTPException(404, "Game not found")
-    return {
+def game_seq(fen: str) -> int:
+    """Monotonic per-game sequence: the ply count encoded in the FEN."""
+    parts = fen.split()
+    if len(parts) < 6:
+        return 0
+    return (int(parts[5]) - 1) * 2 + (0 if parts[1] == "w" else 1)
+
+
+def game_etag(g: Game, include_meta: bool, include_players: bool) -> str:
+    """Validator for GET /games/{id}: the state only changes with seq or status."""
+    return f'W/"{g.id}-{game_seq(g.fen)}-{g.status}-{int(include_meta)}{int(include_players)}"'
+
+
+def game_state(db: Session, g: Game, include_meta: bool = False, include_players: bool = False) -> dict:
+    res = {
         "id": g.id,
+        "seq": game_seq(g.fen),
         "ranked": g.ranked,
         "time_control": g.time_control,
         "fen": g.fen,
-        "pgn": g.pgn,
+        "pgn": game_pgn(db, g),
         "white_id": g.white_id,
         "black_id": g.black_id,
         "status": g.status,
         "result": g.result,
         "end_reason": g.end_reason,
-        "meta": status_flags(g.fen),
     }
+    if include_meta:
+        res["meta"] = status_flags(board_from_fen_or_start(g.fen))
+    if include_players:
+        # Names/ratings for both seats in one query, so clients skip per-player lookups
+        ids = [pid for pid in (g.white_id, g.black_id) if pid]
+        by_id = {p.id: p for p in db.scalars(select(Player).where(Player.id.in_(ids)))} if ids else {}
+        for side, pid in (("white", g.white_id), ("black", g.black_id)):
+            p = by_id.get(pid)
+            res[side] = public_player(p) if p else None
+    return res
+
+
+# --------- Routes ---------
+
+@router.get("/{game_id}")
+def get_game(
+    game_id: int,
+    include_meta: bool = False,
+    include_players: bool = False,
+    response: Response = None,
+    if_none_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    """
+    Game state. `meta` (status flags) is opt-in; clients derive turn/check
+    from the FEN. `include_players` adds `white`/`black` name and rating.
+    Sends an ETag; a matching If-None-Match gets an empty 304.
+    """
+    g = db.get(Game, game_id)
+    if not g:
+        raise HTTPException(404, "Game not found")
+
+    etag = game_etag(g, include_meta, include_players)
+    if if_none_match == etag:
+        # Skips the PGN query and the serialization
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return game_state(db, g, include_meta, include_players)
 
 
 @router.post("/{game_id}/move")
@@ -156,7 +224,7 @@ async def move(
     if not g or g.status != "active":
         raise HTTPException(404, "Game not active")
 
-    b = board_from_fen_or_start(g.fen)
+    b = boards.get(g.id, g.fen)
     is_white_turn = b.turn
 
     # Token identity + turn is the truth
@@ -166,17 +234,17 @@ async def move(
         raise HTTPException(403, "Not your turn")
 
     try:
-        new_fen, san = apply_uci_move(g.fen, req.uci)
+        rec = push_and_record(db, g, b, req.uci)
     except ValueError as e:
         raise HTTPException(400, str(e))
 
-    g.fen = new_fen
-    g.pgn += (san + " ")
-    meta = end_game_if_needed(db, g)
-    maybe_rate(db, g)
+    meta = end_game_if_needed(db, g, b)
     db.commit()
 
-    payload = {"type": "move", "game_id": g.id, "fen": g.fen, "pgn": g.pgn, "meta": meta, "uci": req.uci}
+    # No PGN: clients append `san` (the full text is a query and grows every move)
+    payload = {"type": "move", "game_id": g.id, "fen": g.fen, "meta": meta,
+               "uci": req.uci, "san": rec.san, "ply": rec.ply, "status": g.status,
+               "result": g.result, "end_reason": g.end_reason}
     await hub.broadcast(g.id, payload)
 
     # If opponent is system/bot, respond
@@ -199,7 +267,7 @@ async def chat(
     if not g:
         raise HTTPException(404, "Game not found")
 
-    await hub.broadcast(game_id, {"type": "chat", "player_id": p.id, "text": req.text})
+    await hub.broadcast(game_id, {"type": "chat", "game_id": game_id, "player_id": p.id, "text": req.text})
     return {"ok": True}
 
 
@@ -208,8 +276,45 @@ async def ws_game(ws: WebSocket, game_id: int):
     await hub.join(game_id, ws)
     try:
         while True:
-            # client can send pings; we ignore content
-            await ws.receive_text()
+            # keepalive is protocol-level; the only client message is a codec pick: {"codec": "msgpack"}
+            msg = await ws.receive_text()
+            if msg.startswith("{"):
+                try:
+                    codec = orjson.loads(msg).get("codec")
+                except orjson.JSONDecodeError:
+                    continue
+                if codec:
+                    hub.set_codec(ws, codec)
     finally:
         await hub.leave(game_id, ws)
 
+
+@router.websocket("/ws")
+async def ws_multiplex(ws: WebSocket):
+    """
+    One socket for many games. Clients send {"op": "sub"|"unsub", "game_id": N}
+    (or a codec pick); events carry `game_id` so the client can route them.
+    """
+    await ws.accept()
+    games: set[int] = set()
+    try:
+        while True:
+            try:
+                data = orjson.loads(await ws.receive_text())
+            except orjson.JSONDecodeError:
+                continue
+            if not isinstance(data, dict):
+                continue
+
+            game_id = data.get("game_id")
+            op = data.get("op")
+            if op == "sub" and isinstance(game_id, int):
+                hub.subscribe(game_id, ws)
+                games.add(game_id)
+            elif op == "unsub" and isinstance(game_id, int):
+                hub.unsubscribe(game_id, ws)
+                games.discard(game_id)
+            elif data.get("codec"):
+                hub.set_codec(ws, data["codec"])
+    finally:
+        await hub.leave_all(games, ws)
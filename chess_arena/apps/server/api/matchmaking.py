@@ -1,21 +1,64 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+import asyncio
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Header, WebSocket
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from ..db.session import get_db
+from ..db.session import get_db, SessionLocal
+from ..db.models import Game
 from ..services.matchmaking_service import mm
+from ..api.games import game_state, maybe_play_system_move
 from ..api.players import get_player_from_auth
 
 router = APIRouter(prefix="/matchmaking", tags=["matchmaking"])
 
+# How often a parked ranked player is re-matched against the widening band
+RECHECK_SEC = 2.0
+
 
 class QueueReq(BaseModel):
     ranked: bool = True
     vs_system: bool = False
 
 
+class PlayReq(QueueReq):
+    timeout: float = 60.0
+
+
+def _recheck(player_id: int) -> bool:
+    with SessionLocal() as db:
+        return mm.recheck_ranked(db, player_id)
+
+
+async def _await_match(player_id: int, timeout: float) -> int | None:
+    """
+    wait_match(), but every RECHECK_SEC a player still in the ranked queue is
+    matched again with the wider band; enqueue() alone only checks it once.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return None
+        game_id = await mm.wait_match(player_id, min(RECHECK_SEC, remaining))
+        if game_id:
+            return game_id
+        if await run_in_threadpool(_recheck, player_id):
+            # Recorded for both players; this returns it straight away
+            return await mm.wait_match(player_id, 0)
+
+
+async def _open_vs_system(db: Session, q: dict):
+    """The engine opens a vs_system game it has white in; run once, by the enqueue that created it."""
+    if q["vs_system"] and q["game_id"]:
+        await maybe_play_system_move(db, db.get(Game, q["game_id"]))
+
+
 @router.post("/queue")
-def queue(
+async def queue(
     req: QueueReq,
     db: Session = Depends(get_db),
     authorization: str | None = Header(default=None),
@@ -23,10 +66,84 @@ def queue(
     """Queue for matchmaking using token authentication."""
     p = get_player_from_auth(db, authorization)
     try:
-        return mm.enqueue(db, p.id, ranked=req.ranked, vs_system=req.vs_system)
+        q = await run_in_threadpool(
+            mm.enqueue, db, p.id, ranked=req.ranked, vs_system=req.vs_system, rating=p.rating
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    await _open_vs_system(db, q)
+    return q
+
+
+@router.post("/play")
+async def queue_and_wait(
+    req: PlayReq,
+    db: Session = Depends(get_db),
+    authorization: str | None = Header(default=None),
+):
+    """
+    Queue, wait for a match and return the game state, all in one round-trip.
+    Returns {"status": "waiting", "game_id": None} if no match within `timeout`.
+    """
+    p = get_player_from_auth(db, authorization)
+    player_id = p.id
+    try:
+        # enqueue is sync DB work guarded by a thread lock
+        q = await run_in_threadpool(
+            mm.enqueue, db, player_id, ranked=req.ranked, vs_system=req.vs_system, rating=p.rating
+        )
     except ValueError as e:
         raise HTTPException(400, str(e))
 
+    await _open_vs_system(db, q)
+
+    game_id = q["game_id"]
+    if not game_id:
+        db.close()  # don't hold a pooled connection while parked
+        game_id = await _await_match(player_id, max(0.0, min(req.timeout, 120.0)))
+        if not game_id:
+            return {"status": "waiting", "game_id": None}
+
+    g = db.get(Game, game_id)
+    return {**game_state(db, g), "game_id": g.id}
+
+
+@router.websocket("/ws")
+async def ws_matchmaking(
+    ws: WebSocket,
+    db: Session = Depends(get_db),
+    authorization: str | None = Header(default=None),
+):
+    """
+    Push channel after queueing: sends {"type": "matched", "game_id": N} once
+    this player is paired, then closes. Closing it from the client stops waiting.
+    """
+    try:
+        player_id = get_player_from_auth(db, authorization).id
+    except HTTPException:
+        await ws.close(code=1008)
+        return
+    finally:
+        db.close()  # don't hold a pooled connection while parked
+
+    await ws.accept()
+    # Any client frame or disconnect ends the wait
+    closed = asyncio.ensure_future(ws.receive())
+    try:
+        while True:
+            matched = asyncio.ensure_future(_await_match(player_id, 60.0))
+            await asyncio.wait({closed, matched}, return_when=asyncio.FIRST_COMPLETED)
+            if not matched.done():
+                matched.cancel()
+                return
+            game_id = matched.result()
+            if game_id:
+                await ws.send_text(orjson.dumps({"type": "matched", "game_id": game_id}).decode())
+                await ws.close()
+                return
+    finally:
+        closed.cancel()
+
 
 @router.get("/status")
 def status(
@@ -1,5 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
+import functools
+import math
+import time
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Header
 from jose import jwt
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..db.session import get_db
@@ -8,15 +13,29 @@ from ..settings import settings
 
 router = APIRouter(prefix="/players", tags=["players"])
 
+MAX_BATCH = 100
+
+def public_player(p: Player) -> dict:
+    """What any client may see about a player."""
+    return {"id": p.id, "name": p.name, "rating": p.rating, "is_bot": p.is_bot}
+
+@functools.lru_cache(maxsize=4096)
+def _decode_token(token: str) -> tuple[int, float]:
+    """Verify a token once; returns (player_id, exp epoch). Failures are not cached."""
+    payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_alg])
+    return int(payload["sub"]), float(payload.get("exp", math.inf))
+
 def get_player_from_auth(db: Session, authorization: str | None) -> Player:
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(401, "Missing Bearer token")
     token = authorization.split(" ", 1)[1].strip()
     try:
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_alg])
-        pid = int(payload["sub"])
+        pid, exp = _decode_token(token)
     except Exception:
         raise HTTPException(401, "Invalid token")
+    # Cached entries skip jwt.decode's own expiry check
+    if exp <= time.time():
+        raise HTTPException(401, "Invalid token")
     p = db.get(Player, pid)
     if not p:
         raise HTTPException(401, "Player not found")
@@ -38,3 +57,34 @@ def me(db: Session = Depends(get_db), authorization: str | None = Header(default
         "losses": p.losses,
         "draws": p.draws,
     }
+
+@router.get("/leaderboard")
+def leaderboard(limit: int = 10, db: Session = Depends(get_db)):
+    """Top players by rating."""
+    limit = max(1, min(limit, MAX_BATCH))
+    top = db.scalars(select(Player).order_by(Player.rating.desc()).limit(limit))
+    return [public_player(p) | {"wins": p.wins, "losses": p.losses} for p in top]
+
+@router.get("/{player_id}")
+def get_player(player_id: int, db: Session = Depends(get_db), authorization: str | None = Header(default=None)):
+    """Public info for one player; callers must be logged in."""
+    get_player_from_auth(db, authorization)
+    p = db.get(Player, player_id)
+    if not p:
+        raise HTTPException(404, "Player not found")
+    return public_player(p)
+
+@router.post("/batch")
+def players_batch(
+    ids: list[int] = Body(...),
+    db: Session = Depends(get_db),
+    authorization: str | None = Header(default=None),
+):
+    """Public info for several players in one query; callers must be logged in. Unknown ids are left out."""
+    get_player_from_auth(db, authorization)
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BATCH:
+        raise HTTPException(400, f"At most {MAX_BATCH} ids per batch")
+    if not ids:
+        return []
+    return [public_player(p) for p in db.scalars(select(Player).where(Player.id.in_(ids)))]
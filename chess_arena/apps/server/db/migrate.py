@@ -0,0 +1,34 @@
+"""
+migrate.py
+
+Tiny additive schema upgrade for databases created by an older version.
+`Base.metadata.create_all` only creates missing tables, so columns and
+indexes added to existing tables are applied here.
+"""
+
+from sqlalchemy import inspect, text
+
+from .models import Base
+
+# (table, column, column DDL, backfill SQL run once when the column is added)
+ADDED_COLUMNS = [
+    ("games", "white_is_bot", "BOOLEAN NOT NULL DEFAULT false",
+     "UPDATE games SET white_is_bot = COALESCE((SELECT is_bot FROM players WHERE players.id = games.white_id), false)"),
+    ("games", "black_is_bot", "BOOLEAN NOT NULL DEFAULT false",
+     "UPDATE games SET black_is_bot = COALESCE((SELECT is_bot FROM players WHERE players.id = games.black_id), false)"),
+]
+
+
+def upgrade_schema(engine):
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table, column, ddl, backfill in ADDED_COLUMNS:
+            existing = {c["name"] for c in insp.get_columns(table)}
+            if column not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                if backfill:
+                    conn.execute(text(backfill))
+
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Integer, Boolean, ForeignKey, DateTime, Text, Float
+from sqlalchemy import String, Integer, Boolean, ForeignKey, DateTime, Text, Float, Index, false, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from datetime import datetime
 import secrets
@@ -24,7 +24,7 @@ class Player(Base):
     losses: Mapped[int] = mapped_column(Integer, default=0)
     draws: Mapped[int] = mapped_column(Integer, default=0)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now())
 
     def ensure_api_key(self):
         if not self.api_key:
@@ -32,14 +32,29 @@ class Player(Base):
 
 class Game(Base):
     __tablename__ = "games"
+    # "most recent games with status X" (active games, leaderboards)
+    __table_args__ = (Index("ix_games_status_created", "status", "created_at"),)
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     ranked: Mapped[bool] = mapped_column(Boolean, default=False)
     time_control: Mapped[str] = mapped_column(String(20), default="10+0")
     white_id: Mapped[int | None] = mapped_column(ForeignKey("players.id"), nullable=True)
     black_id: Mapped[int | None] = mapped_column(ForeignKey("players.id"), nullable=True)
+    # Copied from Player.is_bot at creation so the move path needs no player lookups
+    white_is_bot: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
+    black_is_bot: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
     fen: Mapped[str] = mapped_column(Text, default="startpos")
-    pgn: Mapped[str] = mapped_column(Text, default="")
+    pgn: Mapped[str] = mapped_column(Text, default="")  # legacy prefix; new moves go to Move
     status: Mapped[str] = mapped_column(String(20), default="waiting")  # waiting/active/ended
     result: Mapped[str | None] = mapped_column(String(20), nullable=True)  # 1-0, 0-1, 1/2-1/2
     end_reason: Mapped[str | None] = mapped_column(String(64), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now(), index=True)
+
+class Move(Base):
+    """Append-only move log; PGN is rebuilt from it on demand."""
+    __tablename__ = "moves"
+    __table_args__ = (Index("ix_moves_game_ply", "game_id", "ply", unique=True),)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"))
+    ply: Mapped[int] = mapped_column(Integer)  # 0 = White's first move
+    san: Mapped[str] = mapped_column(String(10))
+    uci: Mapped[str] = mapped_column(String(6))
@@ -26,21 +26,37 @@ for p in (str(PROJECT_ROOT), str(PACKAGES_DIR)):
 # -----------------------------------------------------------------------------
 from .db.models import Base
 from .db.session import engine
+from .db.migrate import upgrade_schema
 from .api.auth import router as auth_router
 from .api.players import router as players_router
 from .api.matchmaking import router as mm_router
 from .api.games import router as games_router
 from .api.lobby import router as lobby_router
+from .services.stockfish_service import stockfish
+from .realtime.ws_hub import hub
+from .settings import settings
 
 
 # Ensure storage dir exists for sqlite file
 _Path("storage").mkdir(parents=True, exist_ok=True)
 
-# Create tables
+# Create tables, then add columns/indexes newer than an existing DB
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
 
 app = FastAPI(title="Chess Arena API")
 
+@app.on_event("startup")
+async def start_hub():
+    """Subscribe to cross-worker broadcasts (no-op without Redis)."""
+    await hub.start()
+
+@app.on_event("shutdown")
+async def shutdown_engines():
+    """Stop pooled Stockfish processes and the hub subscription."""
+    await stockfish.close()
+    await hub.stop()
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Standardize error responses."""
@@ -75,9 +91,18 @@ def root():
 if __name__ == "__main__":
     # Prefer CLI for reload:
     # python -m uvicorn chess_arena.apps.server.main:app --reload --host 127.0.0.1 --port 8000
+    # uvloop/httptools ship with uvicorn[standard]; uvloop has no Windows build.
     uvicorn.run(
         "chess_arena.apps.server.main:app",
-        host="127.0.0.1",
-        port=8000,
+        host=settings.host,
+        port=settings.port,
+        workers=settings.web_concurrency,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
+        # Game frames are tiny; deflate costs more CPU than it saves
+        ws_per_message_deflate=False,
+        # Clients hold idle keep-alive connections for 85s between moves
+        timeout_keep_alive=90,
         reload=False,
-    )
\ No newline at end of file
+    )
@@ -1,34 +1,137 @@
+import asyncio
 from collections import defaultdict
+
+import msgpack
+import orjson
 from fastapi import WebSocket
 
+from ..settings import settings
+
+
 class Hub:
-    def __init__(self):
+    """
+    Game WebSocket rooms.
+
+    Sockets are tracked per process. When a Redis URL is configured,
+    broadcasts are published to `game:{id}` and every worker forwards them
+    to its own locally-connected sockets, so multiple workers can serve the
+    same game.
+
+    Payloads are encoded once per broadcast with orjson; sockets that asked
+    for msgpack get one shared msgpack encoding instead.
+    """
+
+    CODECS = ("json", "msgpack")
+
+    def __init__(self, redis_url: str | None = None):
         self.rooms = defaultdict(set)  # game_id -> set[WebSocket]
+        self.codecs: dict[WebSocket, str] = {}  # only non-default codecs
+        self.redis_url = redis_url
+        self._redis = None
+        self._pump_task: asyncio.Task | None = None
+
+    async def start(self):
+        if not self.redis_url or self._pump_task:
+            return
+        import redis.asyncio as aioredis  # only needed for multi-worker fan-out
+
+        self._redis = aioredis.from_url(self.redis_url)
+        self._pump_task = asyncio.create_task(self._pump())
+
+    async def stop(self):
+        if self._pump_task:
+            self._pump_task.cancel()
+            self._pump_task = None
+        if self._redis:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _pump(self):
+        """Forward messages published by any worker to local sockets."""
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.psubscribe("game:*")
+                async for msg in pubsub.listen():
+                    if msg["type"] != "pmessage":
+                        continue
+                    game_id = int(msg["channel"].split(b":", 1)[1])
+                    await self._send_local(game_id, msg["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Connection dropped; resubscribe after a short pause
+                await asyncio.sleep(1)
 
     async def join(self, game_id: int, ws: WebSocket):
         await ws.accept()
+        self.subscribe(game_id, ws)
+
+    def subscribe(self, game_id: int, ws: WebSocket):
         self.rooms[game_id].add(ws)
 
+    def unsubscribe(self, game_id: int, ws: WebSocket):
+        room = self.rooms.get(game_id)
+        if room is None:
+            return
+        room.discard(ws)
+        if not room:
+            self.rooms.pop(game_id, None)
+
+    def set_codec(self, ws: WebSocket, codec: str):
+        if codec not in self.CODECS:
+            return
+        if codec == "json":
+            self.codecs.pop(ws, None)
+        else:
+            self.codecs[ws] = codec
+
     async def leave(self, game_id: int, ws: WebSocket):
-        self.rooms[game_id].discard(ws)
+        await self.leave_all((game_id,), ws)
+
+    async def leave_all(self, game_ids, ws: WebSocket):
+        """Drop a socket from every given room and close it."""
+        for game_id in game_ids:
+            self.unsubscribe(game_id, ws)
+        self.codecs.pop(ws, None)
         try:
             await ws.close()
         except Exception:
             pass
 
-        # Optional: cleanup empty rooms
-        if not self.rooms[game_id]:
-            self.rooms.pop(game_id, None)
+    async def _send_local(self, game_id: int, data: bytes, payload: dict | None = None):
+        """Fan `data` (JSON) out to this worker's sockets; `payload` is its dict, if at hand."""
+        sockets = list(self.rooms.get(game_id, set()))
+        if not sockets:
+            return
 
-    async def broadcast(self, game_id: int, payload: dict):
-        dead = []
-        for ws in list(self.rooms.get(game_id, set())):
-            try:
-                await ws.send_json(payload)
-            except Exception:
-                dead.append(ws)
+        packed = text = None
+        sends = []
+        for ws in sockets:
+            if self.codecs.get(ws) == "msgpack":
+                if packed is None:
+                    # Packed once per broadcast; from Redis only the JSON bytes exist
+                    packed = msgpack.packb(payload if payload is not None else orjson.loads(data), use_bin_type=True)
+                sends.append(ws.send_bytes(packed))
+            else:
+                # JSON goes out as text frames, as it always has
+                if text is None:
+                    text = data.decode()
+                sends.append(ws.send_text(text))
+
+        # Send to every socket concurrently; failures come back as results
+        results = await asyncio.gather(*sends, return_exceptions=True)
 
+        dead = [ws for ws, res in zip(sockets, results) if isinstance(res, Exception)]
         for ws in dead:
             await self.leave(game_id, ws)
 
-hub = Hub()
+    async def broadcast(self, game_id: int, payload: dict):
+        data = orjson.dumps(payload)
+        if self._redis:
+            await self._redis.publish(f"game:{game_id}", data)
+        else:
+            await self._send_local(game_id, data, payload)
+
+
+hub = Hub(settings.redis_url if settings.use_redis_hub else None)
@@ -0,0 +1,76 @@
+"""
+board_cache.py
+
+Keeps the live chess.Board for each active game in memory so the move
+hot path can push moves incrementally instead of re-parsing FEN.
+
+The FEN each board was last stored with is kept alongside it; if the DB
+row disagrees (server restart, another worker moved), the board is
+rebuilt from the row's FEN.
+
+Each entry also counts how often every position (by Zobrist hash) has
+occurred, so threefold repetition is a dict lookup.
+"""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+import chess
+import chess.polyglot
+
+from chess_arena.packages.chesslib.rules import board_from_fen_or_start
+
+
+@dataclass
+class _Entry:
+    fen: str
+    board: chess.Board
+    key: int = 0
+    seen: Counter = field(default_factory=Counter)
+
+
+class BoardCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[int, _Entry] = {}
+
+    def get(self, game_id: int, fen: str) -> chess.Board:
+        """Return the cached board for a game, rebuilding it if stale."""
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry and entry.fen == fen:
+                return entry.board
+
+            # History before a rebuild is unknown; count only this position
+            b = board_from_fen_or_start(fen)
+            key = chess.polyglot.zobrist_hash(b)
+            self._entries[game_id] = _Entry(fen, b, key, Counter({key: 1}))
+            return b
+
+    def store(self, game_id: int, board: chess.Board) -> str:
+        """Record the board's current position; returns its FEN for persisting."""
+        fen = board.fen()
+        key = chess.polyglot.zobrist_hash(board)
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is None or entry.board is not board:
+                entry = self._entries[game_id] = _Entry(fen, board)
+            entry.fen = fen
+            entry.key = key
+            entry.seen[key] += 1
+        return fen
+
+    def repetitions(self, game_id: int) -> int | None:
+        """How many times the game's current position has occurred, if tracked."""
+        with self._lock:
+            entry = self._entries.get(game_id)
+            return entry.seen[entry.key] if entry else None
+
+    def evict(self, game_id: int):
+        with self._lock:
+            self._entries.pop(game_id, None)
+
+
+# Singleton instance
+boards = BoardCache()
@@ -1,61 +1,176 @@
 from collections import deque
+import asyncio
+import bisect
 import random
 import threading
+import time
+
+from sqlalchemy import select
 
 from ..db.models import Game, Player
 from ..settings import settings
 
 
 class MatchmakingService:
+    # Ranked pairs must be within this rating gap; it widens the longer
+    # either player has been waiting so nobody is stranded.
+    BASE_BAND = 100.0
+    BAND_PER_SEC = 10.0
+
     def __init__(self):
+        # Endpoints are sync and run on threadpool threads, so a thread lock
+        # (not asyncio.Lock) guards all queue state.
         self._lock = threading.Lock()
-        self.ranked_q = deque()
+        self.ranked_q: list[tuple[float, int]] = []  # sorted (rating, player_id)
+        self._ranked_waiting: dict[int, tuple[float, float]] = {}  # player_id -> (rating, enqueue time)
         self.free_q = deque()
+        # Games created for a player by someone else's enqueue, until they ask
+        self._matched: dict[int, int] = {}  # player_id -> game_id
+        self._match_waiters: dict[int, tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+
+    def _ranked_remove(self, player_id: int) -> bool:
+        entry = self._ranked_waiting.pop(player_id, None)
+        if entry is None:
+            return False
+        i = bisect.bisect_left(self.ranked_q, (entry[0], player_id))
+        del self.ranked_q[i]
+        return True
+
+    def _pop_ranked_partner(self, player_id: int) -> int | None:
+        """Pair player_id with the closest-rated waiting player inside the band."""
+        rating, since = self._ranked_waiting[player_id]
+        i = bisect.bisect_left(self.ranked_q, (rating, player_id))
+        now = time.monotonic()
+        my_wait = now - since
+
+        best = None
+        # Closest ratings are the immediate neighbours in the sorted queue
+        for j in (i - 1, i + 1):
+            if 0 <= j < len(self.ranked_q):
+                r, pid = self.ranked_q[j]
+                gap = abs(r - rating)
+                wait = max(my_wait, now - self._ranked_waiting[pid][1])
+                if gap <= self.BASE_BAND + self.BAND_PER_SEC * wait and (best is None or gap < best[0]):
+                    best = (gap, pid)
+
+        if best is None:
+            return None
+        self._ranked_remove(player_id)
+        self._ranked_remove(best[1])
+        return best[1]
+
+    def _create_match(self, db, pair: tuple[int, int], ranked: bool) -> Game:
+        """Create the game for two paired players, colours at random. Holds _lock."""
+        p1, p2 = pair
+        white, black = (p1, p2) if random.random() < 0.5 else (p2, p1)
+        w, b = db.get(Player, white), db.get(Player, black)
+
+        g = Game(
+            ranked=ranked,
+            time_control=settings.default_time_control,
+            white_id=white,
+            black_id=black,
+            white_is_bot=bool(w and w.is_bot),
+            black_is_bot=bool(b and b.is_bot),
+            fen="startpos",
+            status="active",
+        )
+        db.add(g)
+        db.commit()
+        db.refresh(g)
+        return g
+
+    def recheck_ranked(self, db, player_id: int) -> bool:
+        """
+        Re-run the band search for a player already in the ranked queue; the
+        band has widened since they (and everyone else) enqueued. On a match
+        both players are notified, so wait_match() returns the game for each.
+        """
+        with self._lock:
+            if player_id not in self._ranked_waiting:
+                return False
+            partner = self._pop_ranked_partner(player_id)
+            if partner is None:
+                return False
+            g = self._create_match(db, (player_id, partner), ranked=True)
+            self._notify_matched(player_id, g.id)
+            self._notify_matched(partner, g.id)
+            return True
+
+    def _notify_matched(self, player_id: int, game_id: int):
+        """Record a match for a player until they ask; wakes wait_match(). Holds _lock."""
+        self._matched[player_id] = game_id
+        waiter = self._match_waiters.pop(player_id, None)
+        if waiter:
+            loop, fut = waiter
+            loop.call_soon_threadsafe(lambda: fut.done() or fut.set_result(None))
+
+    async def wait_match(self, player_id: int, timeout: float) -> int | None:
+        """Long poll: the game id once this player is matched, or None on timeout."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        with self._lock:
+            game_id = self._matched.pop(player_id, None)
+            if game_id is not None:
+                return game_id
+            self._match_waiters[player_id] = (loop, fut)
+
+        try:
+            await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            # Also on cancellation (a matchmaking socket that went away)
+            with self._lock:
+                waiter = self._match_waiters.get(player_id)
+                if waiter and waiter[1] is fut:
+                    del self._match_waiters[player_id]
+
+        with self._lock:
+            return self._matched.pop(player_id, None)
 
     def get_waiting_players(self, db, ranked: bool = None) -> list[dict]:
         """Get list of players waiting in queue."""
-        players = []
-        
+        waiting: list[tuple[int, bool]] = []
+
         with self._lock:
             if ranked is None or ranked is True:
-                for pid in self.ranked_q:
-                    p = db.query(Player).filter(Player.id == pid).first()
-                    if p:
-                        players.append({
-                            "player_id": p.id,
-                            "name": p.name,
-                            "rating": p.rating,
-                            "ranked": True,
-                            "is_bot": p.is_bot
-                        })
-            
+                waiting += [(pid, True) for _, pid in self.ranked_q]
             if ranked is None or ranked is False:
-                for pid in self.free_q:
-                    p = db.query(Player).filter(Player.id == pid).first()
-                    if p:
-                        players.append({
-                            "player_id": p.id,
-                            "name": p.name,
-                            "rating": p.rating,
-                            "ranked": False,
-                            "is_bot": p.is_bot
-                        })
-        
+                waiting += [(pid, False) for pid in self.free_q]
+
+        if not waiting:
+            return []
+
+        # One primary-key IN lookup instead of a query per queued player
+        ids = {pid for pid, _ in waiting}
+        by_id = {p.id: p for p in db.scalars(select(Player).where(Player.id.in_(ids)))}
+
+        players = []
+        for pid, is_ranked in waiting:
+            p = by_id.get(pid)
+            if p:
+                players.append({
+                    "player_id": p.id,
+                    "name": p.name,
+                    "rating": p.rating,
+                    "ranked": is_ranked,
+                    "is_bot": p.is_bot
+                })
+
         return players
 
     def cancel(self, player_id: int) -> bool:
         """Remove a player from all queues."""
         with self._lock:
-            was_queued = False
-            if player_id in self.ranked_q:
-                self.ranked_q.remove(player_id)
-                was_queued = True
+            self._matched.pop(player_id, None)
+            was_queued = self._ranked_remove(player_id)
             if player_id in self.free_q:
                 self.free_q.remove(player_id)
                 was_queued = True
             return was_queued
 
-    def enqueue(self, db, player_id: int, ranked: bool, vs_system: bool) -> dict:
+    def enqueue(self, db, player_id: int, ranked: bool, vs_system: bool, rating: float | None = None) -> dict:
         """
         Enqueue a player for matchmaking.
         
@@ -92,6 +207,8 @@ class MatchmakingService:
                 time_control=settings.default_time_control,
                 white_id=white,
                 black_id=black,
+                white_is_bot=white == bot.id,
+                black_is_bot=black == bot.id,
                 fen="startpos",
                 status="active",
             )
@@ -107,37 +224,53 @@ class MatchmakingService:
             }
 
         # ---- PvP queue ----
-        q = self.ranked_q if ranked else self.free_q
+        if ranked and rating is None:
+            p = db.get(Player, player_id)
+            rating = p.rating if p else 1500.0
 
         with self._lock:
-            # Prevent duplicate queueing
-            if player_id in q:
+            # Someone else's enqueue already paired us
+            game_id = self._matched.pop(player_id, None)
+            if game_id is not None:
                 return {
-                    "status": "waiting",
-                    "game_id": None,
+                    "status": "active",
+                    "game_id": game_id,
                     "ranked": ranked,
                     "vs_system": False
                 }
 
-            q.append(player_id)
-
-            # Match if 2+ players
-            if len(q) >= 2:
-                p1 = q.popleft()
-                p2 = q.popleft()
-                white, black = (p1, p2) if random.random() < 0.5 else (p2, p1)
-
-                g = Game(
-                    ranked=ranked,
-                    time_control=settings.default_time_control,
-                    white_id=white,
-                    black_id=black,
-                    fen="startpos",
-                    status="active",
-                )
-                db.add(g)
-                db.commit()
-                db.refresh(g)
+            pair = None
+            if ranked:
+                # Re-queueing while waiting re-checks with a wider band
+                if player_id not in self._ranked_waiting:
+                    bisect.insort(self.ranked_q, (rating, player_id))
+                    self._ranked_waiting[player_id] = (rating, time.monotonic())
+                partner = self._pop_ranked_partner(player_id)
+                if partner is not None:
+                    pair = (player_id, partner)
+            else:
+                q = self.free_q
+                # Prevent duplicate queueing
+                if player_id in q:
+                    return {
+                        "status": "waiting",
+                        "game_id": None,
+                        "ranked": ranked,
+                        "vs_system": False
+                    }
+
+                q.append(player_id)
+
+                # Match if 2+ players
+                if len(q) >= 2:
+                    pair = (q.popleft(), q.popleft())
+
+            if pair:
+                g = self._create_match(db, pair, ranked)
+
+                for pid in pair:
+                    if pid != player_id:
+                        self._notify_matched(pid, g.id)
 
                 return {
                     "status": "active",
@@ -165,10 +298,8 @@ class MatchmakingService:
             "ranked": bool
         }
         """
-        q = self.ranked_q if ranked else self.free_q
-
         with self._lock:
-            if player_id in q:
+            if player_id in (self._ranked_waiting if ranked else self.free_q):
                 return {
                     "status": "waiting",
                     "game_id": None,
@@ -1,21 +1,84 @@
-from glicko2 import Player as GPlayer
+import math
 
-def update_after_game(white, black, result: str):
-    w = GPlayer(rating=white.rating, rd=white.rd, vol=white.vol)
-    b = GPlayer(rating=black.rating, rd=black.rd, vol=black.vol)
+# Glicko-2 (Glickman), single-game rating period. Same constants as the
+# glicko2 package this replaces.
+TAU = 0.5
+_SCALE = 173.7178
+_EPS = 0.000001
+_PI2 = math.pi ** 2
+
+
+def _g(phi: float) -> float:
+    return 1.0 / math.sqrt(1.0 + 3.0 * phi * phi / _PI2)
+
+
+def _new_vol(phi: float, sigma: float, v: float, delta: float) -> float:
+    """Step 5: solve for the new volatility with the Illinois method."""
+    a = math.log(sigma * sigma)
+    phi2 = phi * phi
+    delta2 = delta * delta
+    tau2 = TAU * TAU
+
+    def f(x: float) -> float:
+        ex = math.exp(x)
+        d = phi2 + v + ex
+        return ex * (delta2 - phi2 - v - ex) / (2.0 * d * d) - (x - a) / tau2
+
+    A = a
+    if delta2 > phi2 + v:
+        B = math.log(delta2 - phi2 - v)
+    else:
+        k = 1
+        while f(a - k * TAU) < 0:
+            k += 1
+        B = a - k * TAU
+
+    fA, fB = f(A), f(B)
+    while abs(B - A) > _EPS:
+        C = A + (A - B) * fA / (fB - fA)
+        fC = f(C)
+        if fC * fB <= 0:
+            A, fA = B, fB
+        else:
+            fA /= 2.0
+        B, fB = C, fC
 
+    return math.exp(A / 2.0)
+
+
+def _rate(rating: float, rd: float, vol: float,
+          opp_rating: float, opp_rd: float, score: float) -> tuple[float, float, float]:
+    mu = (rating - 1500.0) / _SCALE
+    phi = rd / _SCALE
+    mu_j = (opp_rating - 1500.0) / _SCALE
+    g_j = _g(opp_rd / _SCALE)
+
+    e = 1.0 / (1.0 + math.exp(-g_j * (mu - mu_j)))
+    v = 1.0 / (g_j * g_j * e * (1.0 - e))
+    delta = v * g_j * (score - e)
+
+    sigma = _new_vol(phi, vol, v, delta)
+    phi_star = math.sqrt(phi * phi + sigma * sigma)
+    phi_new = 1.0 / math.sqrt(1.0 / (phi_star * phi_star) + 1.0 / v)
+    mu_new = mu + phi_new * phi_new * g_j * (score - e)
+
+    return mu_new * _SCALE + 1500.0, phi_new * _SCALE, sigma
+
+
+def update_after_game(white, black, result: str):
     if result == "1-0":
-        w.update_player([b.rating], [b.rd], [1])
-        b.update_player([w.rating], [w.rd], [0])
+        w_score = 1.0
         white.wins += 1; black.losses += 1
     elif result == "0-1":
-        w.update_player([b.rating], [b.rd], [0])
-        b.update_player([w.rating], [w.rd], [1])
+        w_score = 0.0
         white.losses += 1; black.wins += 1
     else:
-        w.update_player([b.rating], [b.rd], [0.5])
-        b.update_player([w.rating], [w.rd], [0.5])
+        w_score = 0.5
         white.draws += 1; black.draws += 1
 
-    white.rating, white.rd, white.vol = w.rating, w.rd, w.vol
-    black.rating, black.rd, black.vol = b.rating, b.rd, b.vol
+    # Both sides are rated against the opponent's pre-game values
+    w = _rate(white.rating, white.rd, white.vol, black.rating, black.rd, w_score)
+    b = _rate(black.rating, black.rd, black.vol, white.rating, white.rd, 1.0 - w_score)
+
+    white.rating, white.rd, white.vol = w
+    black.rating, black.rd, black.vol = b
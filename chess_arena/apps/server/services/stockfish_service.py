@@ -1,3 +1,4 @@
+import asyncio
 import os
 import chess
 import chess.engine
@@ -6,20 +7,86 @@ from chess_arena.packages.chesslib.rules import board_from_fen_or_start
 
 
 class StockfishService:
-    def __init__(self):
+    """
+    Pool of long-lived Stockfish processes.
+
+    Engines are spawned lazily on first use and reused across moves, so the
+    process start + NNUE load is paid once instead of on every system move.
+    """
+
+    def __init__(self, pool_size: int | None = None):
         self.path = os.environ.get("STOCKFISH_PATH")
+        self.pool_size = pool_size or int(os.environ.get("STOCKFISH_POOL_SIZE", "1"))
+        self.threads = int(os.environ.get("STOCKFISH_THREADS", max(1, (os.cpu_count() or 2) // 2)))
+        self.hash_mb = int(os.environ.get("STOCKFISH_HASH_MB", "256"))
+
+        self._pool: asyncio.Queue | None = None
+        self._engines: list[chess.engine.UciProtocol] = []
+        self._init_lock = asyncio.Lock()
+
+    async def _open_engine(self) -> chess.engine.UciProtocol:
+        _transport, engine = await chess.engine.popen_uci(self.path)
+        await engine.configure({"Threads": self.threads, "Hash": self.hash_mb})
+        return engine
+
+    async def _ensure_pool(self) -> asyncio.Queue:
+        if self._pool is not None:
+            return self._pool
+
+        async with self._init_lock:
+            if self._pool is None:
+                if not self.path or not os.path.exists(self.path):
+                    raise FileNotFoundError(
+                        f"Stockfish executable not found. STOCKFISH_PATH='{self.path}'"
+                    )
 
-    def best_move_uci(self, fen: str, think_ms: int = 200) -> str:
-        if not self.path or not os.path.exists(self.path):
-            raise FileNotFoundError(
-                f"Stockfish executable not found. STOCKFISH_PATH='{self.path}'"
-            )
+                pool: asyncio.Queue = asyncio.Queue()
+                for _ in range(self.pool_size):
+                    engine = await self._open_engine()
+                    self._engines.append(engine)
+                    pool.put_nowait(engine)
+                self._pool = pool
 
+        return self._pool
+
+    async def best_move_uci(self, fen: str, think_ms: int = 200) -> str:
+        pool = await self._ensure_pool()
         b = board_from_fen_or_start(fen)
-        with chess.engine.SimpleEngine.popen_uci(self.path) as engine:
+
+        engine = await pool.get()
+        try:
             limit = chess.engine.Limit(time=think_ms / 1000.0)
-            result = engine.play(b, limit)
-            return result.move.uci()
+            result = await engine.play(b, limit)
+        except chess.engine.EngineTerminatedError:
+            # Process died; never hand it out again. Replace it so the pool
+            # keeps its size, or leave the slot empty if the respawn fails.
+            self._engines.remove(engine)
+            await self._replace_engine(pool)
+            raise
+        except BaseException:
+            pool.put_nowait(engine)
+            raise
+
+        pool.put_nowait(engine)
+        return result.move.uci()
+
+    async def _replace_engine(self, pool: asyncio.Queue) -> None:
+        try:
+            engine = await self._open_engine()
+        except Exception:
+            return
+        self._engines.append(engine)
+        pool.put_nowait(engine)
+
+    async def close(self):
+        """Shut down all pooled engine processes."""
+        for engine in self._engines:
+            try:
+                await engine.quit()
+            except Exception:
+                pass
+        self._engines.clear()
+        self._pool = None
 
 
 stockfish = StockfishService()
@@ -8,5 +8,11 @@ class Settings(BaseModel):
     db_url: str = os.getenv("DATABASE_URL", "sqlite:///storage/dev.db")
     stockfish_path: str = os.getenv("STOCKFISH_PATH", "stockfish")  # set env to .exe on Windows
     default_time_control: str = os.getenv("DEFAULT_TIME_CONTROL", "10+0")
+    host: str = os.getenv("HOST", "127.0.0.1")
+    port: int = int(os.getenv("PORT", "8000"))
+    # WebSocket rooms are per process; >1 needs USE_REDIS_HUB
+    web_concurrency: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    use_redis_hub: bool = os.getenv("USE_REDIS_HUB", "false").lower() == "true"
+    redis_url: str = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
 
 settings = Settings()
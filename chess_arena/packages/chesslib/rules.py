@@ -5,25 +5,49 @@ def board_from_fen_or_start(fen: str) -> chess.Board:
         return chess.Board()
     return chess.Board(fen)
 
-def apply_uci_move(fen: str, uci: str) -> tuple[str, str]:
-    b = board_from_fen_or_start(fen)
+def push_uci(b: chess.Board, uci: str) -> str:
+    """Validate and push a UCI move onto b in place; returns its SAN."""
     move = chess.Move.from_uci(uci)
-    if move not in b.legal_moves:
+    # is_legal is a direct bitboard check (no LegalMoveGenerator wrapper);
+    # san_and_push avoids the extra push/pop that san() does internally.
+    if not b.is_legal(move):
         raise ValueError("Illegal move")
-    san = b.san(move)
-    b.push(move)
-    return b.fen(), san
+    return b.san_and_push(move)
 
-def status_flags(fen: str) -> dict:
+def apply_uci_move(fen: str, uci: str) -> tuple[str, str]:
     b = board_from_fen_or_start(fen)
+    san = push_uci(b, uci)
+    return b.fen(), san
+
+def status_flags(b: chess.Board, repetitions: int | None = None) -> dict:
+    # repetitions: occurrences of this position if the caller tracks them
+    # (e.g. a per-game Zobrist count); otherwise threefold uses b.move_stack.
+
+    # One move-generation pass serves check/mate/stalemate
+    in_check = b.is_check()
+    has_legal = any(b.generate_legal_moves())
+
+    # Threefold needs 3 occurrences 4 plies apart with no irreversible move
+    # in between (counting the claiming move), so skip the O(history) walk
+    # until that is possible. Likewise fifty-move needs 99+ reversible plies.
+    if repetitions is not None:
+        can_threefold = repetitions >= 3
+    else:
+        can_threefold = (
+            b.halfmove_clock >= 7
+            and len(b.move_stack) >= 7
+            and b.can_claim_threefold_repetition()
+        )
+    can_fifty = b.halfmove_clock >= 99 and b.can_claim_fifty_moves()
+
     return {
         "turn": "white" if b.turn else "black",
-        "in_check": b.is_check(),
-        "is_checkmate": b.is_checkmate(),
-        "is_stalemate": b.is_stalemate(),
+        "in_check": in_check,
+        "is_checkmate": in_check and not has_legal,
+        "is_stalemate": not in_check and not has_legal,
         "insufficient": b.is_insufficient_material(),
-        "can_claim_threefold": b.can_claim_threefold_repetition(),
-        "can_claim_fifty": b.can_claim_fifty_moves(),
+        "can_claim_threefold": can_threefold,
+        "can_claim_fifty": can_fifty,
         "halfmove_clock": b.halfmove_clock,
         "fullmove_number": b.fullmove_number,
     }
@@ -0,0 +1,148 @@
+import base64
+import hashlib
+import importlib.util
+import json
+import os
+import time
+from pathlib import Path
+
+import httpx
+import orjson
+
+__all__ = ["HTTP2", "TOKEN_DIR", "APIClientBase"]
+
+
+# HTTP/2 needs the optional `h2` package (pip install httpx[http2]); without
+# it, or against an HTTP/1.1-only server, httpx just speaks HTTP/1.1
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Logins are cached here so restarts can reuse a still-valid token
+TOKEN_DIR = Path.home() / ".chess_arena"
+
+
+def _token_exp(token: str) -> float:
+    """`exp` claim of a JWT, read without verifying (the server does that)."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0.0
+
+
+class APIClientBase:
+    """
+    Connection, auth-header and token-cache plumbing shared by the desktop
+    and bot API clients.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.token: str | None = None
+        self.player_id: int | None = None
+        self.name: str | None = None
+        self._token_file: Path | None = None
+
+        # One pooled keep-alive client for every request
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            timeout=30,
+            # Concurrent requests share one connection as HTTP/2 streams
+            http2=HTTP2,
+            # Idle sockets stay open across think time; the server keeps
+            # them for 90s, so expire ours a little sooner (httpx default: 5s)
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=40,
+                keepalive_expiry=85.0,
+            ),
+        )
+
+    def close(self):
+        """Close the underlying HTTP connection pool."""
+        self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----------------- helpers -----------------
+
+    def _set_token(self, token: str | None):
+        """Store the token and send it as the default Authorization header."""
+        self.token = token
+        if token:
+            self._client.headers["Authorization"] = f"Bearer {token}"
+        else:
+            self._client.headers.pop("Authorization", None)
+
+    def _token_path(self, identity: str) -> Path:
+        # Hash the identity (email or API key) so it never appears in file names
+        key = hashlib.sha256(f"{self.base_url}|{identity}".encode()).hexdigest()[:16]
+        return TOKEN_DIR / f"{key}.json"
+
+    def _load_login(self, path: Path) -> dict | None:
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get("expiry", 0) <= time.time() + 60:
+            return None
+
+        self._set_token(data.get("token"))
+        self.player_id = data.get("player_id")
+        self.name = data.get("name")
+        self._token_file = path
+        return data
+
+    def _save_login(self, path: Path, data: dict, **extra):
+        token = data.get("token")
+        if not token:
+            return
+        entry = {
+            "token": token,
+            "player_id": data.get("player_id"),
+            "name": data.get("name"),
+            "expiry": _token_exp(token),
+            **extra,
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except OSError:
+            return  # cache is best-effort
+        self._token_file = path
+
+    def _forget_login(self):
+        if self._token_file:
+            self._token_file.unlink(missing_ok=True)
+            self._token_file = None
+
+    def _post_json(self, path: str, obj, **kwargs) -> httpx.Response:
+        # orjson encodes straight to bytes; httpx's json= goes through stdlib json
+        return self._client.post(
+            path,
+            content=orjson.dumps(obj),
+            headers={"Content-Type": "application/json"},
+            **kwargs,
+        )
+
+    def _raise(self, r: httpx.Response):
+        """Raise HTTPStatusError with response body."""
+        if r.status_code == 401:
+            # A cached token the server no longer accepts
+            self._forget_login()
+        try:
+            r.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise httpx.HTTPStatusError(
+                f"{e} | response={r.text}",
+                request=e.request,
+                response=e.response,
+            )